@@ -9,20 +9,32 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from utils.logging_config import setup_logging
-from interfaces.cli.app import CLIApp
 
 
 async def main():
     """Main entry point for CLI application."""
     setup_logging()
-    
+
+    # Import the app lazily so startup doesn't pay for the SDK imports up front
+    from interfaces.cli.app import CLIApp
+
     app = CLIApp()
     await app.run()
 
 
+def get_loop_factory():
+    """Return uvloop's loop factory when available, else None for the default loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=get_loop_factory()) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("\nGoodbye!")
     except Exception as e:
@@ -12,14 +12,18 @@ This script demonstrates UV's script capabilities with inline dependency metadat
 # ]
 # ///
 
-import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+import json
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import typer
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
 app = typer.Typer(help="🛠️ Development utilities for MCP Agents Starter")
 console = Console()
 
@@ -58,12 +62,28 @@ def lint():
         ["uv", "run", "mypy", "src/"],
     ]
     
-    for cmd in commands:
+    # The linters don't depend on each other, so run them side by side and
+    # report their output in order once they all finish
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        futures = [
+            executor.submit(subprocess.run, cmd, capture_output=True, text=True)
+            for cmd in commands
+        ]
+        results = [future.result() for future in futures]
+    
+    failed = False
+    for cmd, result in zip(commands, results):
         console.print(f"Running: [bold cyan]{' '.join(cmd)}[/bold cyan]")
-        result = subprocess.run(cmd)
+        if result.stdout:
+            console.print(result.stdout, end="", markup=False, highlight=False)
+        if result.stderr:
+            console.print(result.stderr, end="", markup=False, highlight=False)
         if result.returncode != 0:
             console.print("❌ Linting failed", style="red")
-            sys.exit(1)
+            failed = True
+    
+    if failed:
+        sys.exit(1)
     
     console.print("✅ All linting passed!", style="green")
 
@@ -72,6 +92,7 @@ def format_code():
     """🎨 Format code with black and ruff."""
     console.print(Panel("🎨 Formatting code", style="bold magenta"))
     
+    # Kept sequential: black must see the files after ruff has fixed them
     subprocess.run(["uv", "run", "ruff", "check", "--fix", "src/", "scripts/", "tests/"])
     subprocess.run(["uv", "run", "black", "src/", "scripts/", "tests/"])
     
@@ -89,6 +110,62 @@ def start_web():
     console.print(Panel("🌐 Starting web application", style="bold blue"))
     subprocess.run(["uv", "run", "streamlit", "run", "scripts/streamlit.py", "--server.port", "8505"])
 
+INFO_CACHE_FILE = Path.home() / ".cache" / "mcp_starter" / "info.json"
+VERSION_COMMANDS = {
+    "uv": ["uv", "--version"],
+    "python": ["uv", "run", "python", "--version"],
+}
+
+
+def _command_output(cmd: list[str]) -> str:
+    """Run a command and return its combined output, like subprocess.getoutput."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        return str(e)
+    return (result.stdout + result.stderr).strip()
+
+
+def _tool_versions() -> dict[str, str]:
+    """Get uv/Python versions, cached on disk until uv.lock, Python or uv changes."""
+    lock_file = Path("uv.lock")
+    uv_path = shutil.which("uv")
+    cache_key = (
+        [
+            lock_file.stat().st_mtime_ns,
+            sys.version,
+            uv_path,
+            Path(uv_path).stat().st_mtime_ns if uv_path else None,
+        ]
+        if lock_file.exists()
+        else None
+    )
+    
+    if cache_key is not None and INFO_CACHE_FILE.exists():
+        try:
+            cached = json.loads(INFO_CACHE_FILE.read_text())
+            if cached.get("key") == cache_key:
+                return cached["versions"]
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    # Both commands are independent; `uv run` is the slow one
+    with ThreadPoolExecutor(max_workers=len(VERSION_COMMANDS)) as executor:
+        futures = {
+            name: executor.submit(_command_output, cmd)
+            for name, cmd in VERSION_COMMANDS.items()
+        }
+        versions = {name: future.result() for name, future in futures.items()}
+    
+    if cache_key is not None:
+        try:
+            INFO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            INFO_CACHE_FILE.write_text(json.dumps({"key": cache_key, "versions": versions}))
+        except OSError:
+            pass
+    
+    return versions
+
 @app.command()
 def info():
     """ℹ️ Show project information."""
@@ -96,9 +173,11 @@ def info():
     table.add_column("Aspect", style="cyan")
     table.add_column("Details", style="magenta")
     
+    versions = _tool_versions()
+    
     table.add_row("Project", "MCP Agents Starter")
-    table.add_row("UV Version", subprocess.getoutput("uv --version"))
-    table.add_row("Python Version", subprocess.getoutput("uv run python --version"))
+    table.add_row("UV Version", versions["uv"])
+    table.add_row("Python Version", versions["python"])
     table.add_row("Environment", str(Path(".venv").absolute()) if Path(".venv").exists() else "Not created")
     
     console.print(table)
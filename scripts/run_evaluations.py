@@ -9,6 +9,9 @@ Make sure your LMNR_PROJECT_API_KEY is set in your environment.
 
 from lmnr import evaluate
 
+# How many dataset examples the executor runs on at the same time
+EVALUATION_CONCURRENCY = 10
+
 
 def main():
     """Run a sample evaluation."""
@@ -37,7 +40,9 @@ def main():
     # The executor is the function or system you want to test.
     # It takes a dictionary of data and should return an output.
     # Here, we are simulating a simple lookup. This could be a call to your LLM.
-    def get_capital_from_data(data: dict) -> str:
+    # It is async so Laminar can run several examples concurrently; with a real
+    # LLM call, await the client here (e.g. AsyncAnthropic().messages.create).
+    async def get_capital_from_data(data: dict) -> str:
         # A real executor would likely call an API or a model.
         # This is a dummy implementation for demonstration.
         capitals = {
@@ -61,6 +66,7 @@ def main():
         executor=get_capital_from_data,
         evaluators=evaluators,
         group_id="capital_city_lookup_v1",
+        concurrency_limit=EVALUATION_CONCURRENCY,
     )
 
     print("\nEvaluation complete!")
@@ -7,10 +7,11 @@ from pathlib import Path
 # Add src to path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from utils.logging_config import setup_logging
 
 def main():
     """Main entry point for Streamlit application."""
+    from utils.logging_config import setup_logging
+
     setup_logging()
     
     # Import streamlit app after path setup
@@ -1,21 +1,32 @@
 """CLI Application for MCP client."""
 
+import asyncio
 import logging
 from typing import Any, Dict, List
 
 from anthropic import APIError
-from lmnr import Laminar
-from mcp.types import TextContent, ImageContent, EmbeddedResource
 
 from mcp_client.config.manager import ConfigurationManager
-from mcp_client.servers.registry import MCPServerRegistry
 from mcp_client.llm.client import LLMClient
-from mcp_client.llm.conversation import ChatSession
+from mcp_client.llm.conversation import ChatSession, tool_result_text
+from mcp_client.servers.registry import MCPServerRegistry
+from utils.executor import create_executor
 from utils.logging_config import get_logger
+from utils.tracing import init_laminar
 
 logger = get_logger(__name__)
 
 
+def _is_plain_user_message(msg: Dict[str, Any]) -> bool:
+    """Whether a message is a user turn rather than a carrier of tool results."""
+    if msg["role"] != "user":
+        return False
+    content = msg.get("content")
+    return not isinstance(content, list) or not any(
+        isinstance(item, dict) and item.get("type") == "tool_result" for item in content
+    )
+
+
 class CLIApp:
     """CLI Application for MCP client."""
 
@@ -24,12 +35,17 @@ class CLIApp:
         self.server_registry = None
         self.llm_client = None
         self.chat_session = None
+        self._executor = None
 
     async def initialize(self) -> bool:
         """Initialize the CLI application."""
         try:
             # Initialize Laminar for tracing
-            Laminar.initialize()
+            init_laminar()
+
+            # Size the default executor for sync work offloaded via run_in_executor
+            self._executor = create_executor()
+            asyncio.get_running_loop().set_default_executor(self._executor)
             
             # Initialize server registry
             self.server_registry = MCPServerRegistry(self.config)
@@ -52,7 +68,7 @@ class CLIApp:
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize CLI application: {e}")
+            logger.error("Failed to initialize CLI application: %s", e)
             return False
 
     async def run(self):
@@ -66,10 +82,10 @@ class CLIApp:
         try:
             # Get all available tools
             all_tools = await self.server_registry.get_all_tools()
-            all_tools_anthropic_schema = [tool.get_anthropic_schema() for tool in all_tools]
+            all_tools_anthropic_schema = [tool.anthropic_schema for tool in all_tools]
             
             # Get system prompt
-            system_prompt = await self.chat_session.get_system_prompt()
+            system_prompt = self.chat_session.get_system_prompt()
             
             # Initialize conversation
             messages = await self.chat_session.initialize_conversation()
@@ -81,19 +97,21 @@ class CLIApp:
                         logger.info("\nExiting...")
                         break
 
-                    messages.append({"role": "user", "content": user_input})
+                    self.chat_session.append_message(messages, {"role": "user", "content": user_input})
 
-                    # Clean messages before sending to API
-                    clean_messages = self.chat_session.clean_messages_for_api(messages)
+                    # Cleaned view is maintained incrementally by the chat session
+                    clean_messages = self.chat_session.api_messages
                     
-                    response = self.llm_client.get_response(
-                        clean_messages, tools=all_tools_anthropic_schema, system_prompt=system_prompt
+                    response = self._stream_response(
+                        self.chat_session.compress_tool_results(clean_messages),
+                        all_tools_anthropic_schema,
+                        system_prompt,
                     )
 
                     await self._process_response(response, messages, all_tools_anthropic_schema, system_prompt)
 
                 except APIError as e:
-                    logger.error(f"LLM API Error: {e}. Please check your API key and network.")
+                    logger.error("LLM API Error: %s. Please check your API key and network.", e)
                     # If it's a token limit error, try to recover by aggressive pruning
                     if "prompt is too long" in str(e):
                         await self._handle_token_limit_error(messages)
@@ -104,6 +122,31 @@ class CLIApp:
         finally:
             if self.chat_session:
                 await self.chat_session.cleanup_servers()
+            if self._executor:
+                self._executor.shutdown(wait=False)
+
+    def _stream_response(
+        self,
+        messages: List[Dict[str, Any]],
+        tools_schema: List[Dict[str, Any]],
+        system_prompt: str,
+    ):
+        """Get an LLM response, printing assistant text as it streams in."""
+        started = False
+
+        def on_text(text: str) -> None:
+            nonlocal started
+            if not started:
+                print("\nAssistant: ", end="", flush=True)
+                started = True
+            print(text, end="", flush=True)
+
+        response = self.llm_client.stream_response(
+            messages, tools=tools_schema, system_prompt=system_prompt, on_text=on_text
+        )
+        if started:
+            print(flush=True)
+        return response
 
     async def _process_response(
         self, 
@@ -120,7 +163,7 @@ class CLIApp:
             
             for content in response.content:
                 if content.type == "text":
-                    logger.info(f"\nAssistant: {content.text}")
+                    # Text was already printed while streaming
                     assistant_content.append({"type": "text", "text": content.text})
                     if len(response.content) == 1:
                         process_response = False
@@ -134,110 +177,105 @@ class CLIApp:
                     
             # Only append the assistant message if it has content
             if assistant_content:
-                messages.append({"role": "assistant", "content": assistant_content})
+                self.chat_session.append_message(messages, {"role": "assistant", "content": assistant_content})
             
             # Process any tool calls
             tool_results = await self._execute_tool_calls(response)
             
             # If we have tool results, send them and get another response
             if tool_results:
-                messages.append({"role": "user", "content": tool_results})
+                self.chat_session.append_message(messages, {"role": "user", "content": tool_results})
                 
                 # Check if we need to summarize before pruning
                 self.chat_session.message_count += 1
                 if self.chat_session.message_count % 20 == 0:  # Summarize every 20 messages
+                    previous_summary = self.chat_session.conversation_summary
                     new_summary = await self.chat_session.summarize_conversation(messages)
-                    if new_summary:
-                        self.chat_session.conversation_summary = new_summary
+                    if new_summary and new_summary != previous_summary:
                         # Store summary in memory
                         await self.chat_session.store_in_memory("conversation_summary", self.chat_session.conversation_summary)
                 
-                # Prune messages with summary context
-                messages = self.chat_session.prune_messages_with_summary(messages, self.chat_session.conversation_summary)
+                # Prune messages with summary context (in place, so run() sees it too)
+                pruned = self.chat_session.prune_messages_with_summary(messages, self.chat_session.conversation_summary)
+                if pruned is not messages:
+                    messages[:] = pruned
+                    self.chat_session.reset_api_messages(messages)
                 
-                # Clean messages before sending to API
-                clean_messages = self.chat_session.clean_messages_for_api(messages)
+                # Cleaned view is maintained incrementally by the chat session
+                clean_messages = self.chat_session.api_messages
                 
-                response = self.llm_client.get_response(
-                    clean_messages, tools=tools_schema, system_prompt=system_prompt
+                response = self._stream_response(
+                    self.chat_session.compress_tool_results(clean_messages),
+                    tools_schema,
+                    system_prompt,
                 )
                 
                 # Check if this response is just text (final response)
                 if len(response.content) == 1 and response.content[0].type == "text":
-                    logger.info(f"\nFinal response: {response.content[0].text}")
-                    messages.append({"role": "assistant", "content": [{"type": "text", "text": response.content[0].text}]})
+                    self.chat_session.append_message(messages, {"role": "assistant", "content": [{"type": "text", "text": response.content[0].text}]})
                     process_response = False
             else:
                 # No tool calls, we're done processing
                 process_response = False
 
     async def _execute_tool_calls(self, response) -> List[Dict[str, Any]]:
-        """Execute tool calls from LLM response."""
+        """Execute tool calls from LLM response concurrently."""
+        calls = [
+            (content.id, content.name, content.input)
+            for content in response.content
+            if content.type == "tool_use"
+        ]
+        if not calls:
+            return []
+
+        for _, tool_name, tool_input in calls:
+            logger.info("Executing tool: %s", tool_name)
+            logger.info("With arguments: %s", tool_input)
+
+        # Dispatch all tool calls at once; MCP round-trips are I/O bound
+        results = await asyncio.gather(
+            *(self.server_registry.execute_tool(name, args) for _, name, args in calls),
+            return_exceptions=True,
+        )
+
         tool_results = []
-        
-        for content in response.content:
-            if content.type == "tool_use":
-                tool_name = content.name
-                tool_input = content.input
-                tool_use_id = content.id
-                
-                logger.info(f"Executing tool: {tool_name}")
-                logger.info(f"With arguments: {tool_input}")
-                
-                try:
-                    result_obj = await self.server_registry.execute_tool(tool_name, tool_input)
-                    
-                    # Extract text content from result
-                    text_parts = []
-                    if isinstance(result_obj.content, list):
-                        for content_item in result_obj.content:
-                            if isinstance(content_item, TextContent):
-                                text_parts.append(content_item.text)
-                            elif isinstance(content_item, ImageContent):
-                                # Handle image content - just indicate an image was returned
-                                text_parts.append("[Image content returned]")
-                            elif isinstance(content_item, EmbeddedResource):
-                                # Handle embedded resources
-                                text_parts.append(f"[Resource: {content_item.resource.uri}]")
-                            else:
-                                text_parts.append(str(content_item))
-                    else:
-                        text_parts.append(str(result_obj.content))
-                    
-                    result_text = " ".join(text_parts) if text_parts else ""
-                    
-                    # Truncate very long results (like base64 images)
-                    if len(result_text) > 10000:
-                        result_text = result_text[:1000] + f"... [Content truncated, original length: {len(result_text)}]"
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_use_id,
-                        "content": result_text
-                    })
-                    
-                except Exception as e:
-                    error_msg = f"Error executing tool {tool_name}: {str(e)}"
-                    logger.error(error_msg)
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_use_id,
-                        "content": error_msg
-                    })
-        
+        for (tool_use_id, tool_name, _), result_obj in zip(calls, results):
+            if isinstance(result_obj, BaseException):
+                error_msg = f"Error executing tool {tool_name}: {str(result_obj)}"
+                logger.error(error_msg)
+                tool_results.append({
+                    "type": "tool_result",
+                    "tool_use_id": tool_use_id,
+                    "content": error_msg
+                })
+                continue
+
+            result_text = tool_result_text(result_obj)
+
+            tool_results.append({
+                "type": "tool_result",
+                "tool_use_id": tool_use_id,
+                "content": result_text
+            })
+
         return tool_results
 
     async def _handle_token_limit_error(self, messages: List[Dict[str, Any]]):
         """Handle token limit error by emergency pruning."""
         logger.info("Attempting to recover from token limit error...")
-        # Create emergency summary
+        # Create emergency summary; this also updates chat_session.conversation_summary
         emergency_summary = await self.chat_session.summarize_conversation(messages)
         if emergency_summary:
             await self.chat_session.store_in_memory("emergency_summary", emergency_summary)
-        
-        # Keep only last 5 messages
-        messages = messages[-5:]
-        
-        # Ensure valid message sequence
-        while messages and messages[0]["role"] != "user":
-            messages.pop(0) 
\ No newline at end of file
+
+        # Keep roughly the last 5 messages (in place, so the caller sees the
+        # pruning), starting at a plain user message: a user message holding
+        # tool results would be orphaned from its tool_use and rejected by the API
+        plain_users = [i for i, msg in enumerate(messages) if _is_plain_user_message(msg)]
+        window_start = max(0, len(messages) - 5)
+        start = next((i for i in plain_users if i >= window_start), None)
+        if start is None:
+            # No question in the window: go back to the one it is answering
+            start = max((i for i in plain_users if i < window_start), default=0)
+        del messages[:start]
+        self.chat_session.reset_api_messages(messages) 
\ No newline at end of file
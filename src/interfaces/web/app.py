@@ -1,27 +1,19 @@
 """Streamlit Web Application for MCP client."""
 
 import streamlit as st
-from lmnr import Laminar
 
-from utils.logging_config import setup_logging, get_logger
-from src.interfaces.web.core.session_state import SessionManager
+from src.interfaces.web.components.chat import display_chat_history
+from src.interfaces.web.components.sidebar import sidebar_content
 from src.interfaces.web.core.initialization import initialize_mcp_components
 from src.interfaces.web.core.processing import process_llm_response
-from src.interfaces.web.components.sidebar import sidebar_content
-from src.interfaces.web.components.chat import display_chat_history
+from src.interfaces.web.core.session_state import SessionManager
+from utils.logging_config import get_logger, setup_logging
+from utils.tracing import init_laminar
 
 logger = get_logger(__name__)
 
-# Page config
-st.set_page_config(
-    page_title="PAI Assistant",
-    page_icon="🤖",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
 # Custom CSS for better message styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .assistant-thinking {
         background-color: #f0f2f6;
@@ -38,13 +30,31 @@ st.markdown("""
         border-radius: 5px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def configure_page():
+    """Apply page config and inject the custom CSS.
+
+    Streamlit clears every element that isn't re-emitted on a rerun, and
+    this module is imported only once per process, so this has to run from
+    `main()` rather than at import time.
+    """
+    st.set_page_config(
+        page_title="PAI Assistant",
+        page_icon="🤖",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 
 def main():
     """Main Streamlit application."""
-    # Initialize Laminar for tracing
-    Laminar.initialize()
+    configure_page()
+
+    # Initialize Laminar for tracing (no-op on reruns)
+    init_laminar()
     
     # Initialize session state
     SessionManager.initialize()
@@ -82,16 +92,19 @@ def main():
                 placeholder = st.empty()
 
                 try:
-                    tools_schema = [tool.get_anthropic_schema() for tool in st.session_state.available_tools]
+                    tools_schema = st.session_state.tools_schema
 
-                    # Clean messages before sending to API
-                    clean_messages = st.session_state.chat_session.clean_messages_for_api(st.session_state.messages)
+                    # Cleaned messages are maintained incrementally by SessionManager.add_message
+                    clean_messages = st.session_state.chat_session.compress_tool_results(
+                        st.session_state.clean_messages
+                    )
 
                     with st.spinner("🤔 Thinking..."):
-                        response = st.session_state.llm_client.get_response(
+                        response = st.session_state.llm_client.get_response_with_streaming(
                             clean_messages,
                             tools=tools_schema,
-                            system_prompt="You are a helpful assistant. Use tools when appropriate."
+                            system_prompt="You are a helpful assistant. Use tools when appropriate.",
+                            placeholder=placeholder,
                         )
 
                     # Process response
@@ -1,8 +1,11 @@
 """Streamlit sidebar component."""
 
+from itertools import islice
+
 import streamlit as st
-from ..core.session_state import SessionManager
+
 from ..core.initialization import cleanup_all_resources
+from ..core.session_state import SessionManager
 
 
 def sidebar_content():
@@ -30,9 +33,9 @@ def sidebar_content():
         st.subheader("📊 Conversation Stats")
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Messages", len(st.session_state.get("display_messages", [])))
+            st.metric("Messages", st.session_state.get("message_count", 0))
         with col2:
-            st.metric("Tool Calls", len(st.session_state.get("tool_execution_log", [])))
+            st.metric("Tool Calls", st.session_state.get("tool_call_count", 0))
 
         # Actions
         st.subheader("Actions")
@@ -47,7 +50,9 @@ def sidebar_content():
         # Tool Execution Log
         if "tool_execution_log" in st.session_state and st.session_state.tool_execution_log:
             with st.expander("📝 Recent Tool Executions", expanded=False):
-                for log in st.session_state.tool_execution_log[-5:]:  # Show last 5
+                # Show last 5, oldest first
+                recent = list(islice(reversed(st.session_state.tool_execution_log), 5))
+                for log in reversed(recent):
                     st.text(f"🔧 {log['tool']}")
                     st.caption(f"{log['timestamp'][:19]}")
                     st.text("Input:")
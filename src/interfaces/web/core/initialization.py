@@ -1,15 +1,55 @@
 """Initializes MCP components for the Streamlit application."""
 
+import asyncio
+import queue
+from typing import List
+
 import streamlit as st
-import time
+
 from mcp_client.config.manager import ConfigurationManager
-from mcp_client.servers.registry import StreamlitMCPServerRegistry
-from mcp_client.llm.client import StreamlitLLMClient
 from mcp_client.llm.conversation import ChatSession
+from mcp_client.servers.connection import StreamlitMCPServer
+from mcp_client.servers.registry import StreamlitMCPServerRegistry
 from utils.logging_config import get_logger
 
+from .resources import get_config, get_llm_client
+
 logger = get_logger(__name__)
 
+# Seconds each server gets to start; generous, as first runs of npx-based
+# servers download their packages
+SERVER_INIT_TIMEOUT = 120
+
+# API keys injected into a server's environment: server name -> (env var, config getter)
+_ENV_INJECTORS = {
+    "google-maps": ("GOOGLE_MAPS_API_KEY", lambda config: config.google_maps_api_key),
+    "tavily": ("TAVILY_API_KEY", lambda config: config.tavily_api_key),
+}
+
+
+async def _initialize_servers(
+    servers: List[StreamlitMCPServer], completed: queue.Queue
+) -> None:
+    """Initialize servers concurrently, reporting each result on `completed`.
+
+    Each server reports (name, success), with success None when it didn't
+    start within SERVER_INIT_TIMEOUT.
+    """
+
+    async def _init_one(server: StreamlitMCPServer) -> None:
+        try:
+            success = await asyncio.wait_for(server.initialize_async(), SERVER_INIT_TIMEOUT)
+        except TimeoutError:
+            logger.error("Timed out initializing server: %s", server.name)
+            success = None
+            try:
+                await server.cleanup()
+            except Exception as e:
+                logger.error("Error cleaning up server %s: %s", server.name, e)
+        completed.put((server.name, success))
+
+    await asyncio.gather(*(_init_one(server) for server in servers))
+
 
 def initialize_mcp_components():
     """Initialize MCP components with progress feedback."""
@@ -17,14 +57,14 @@ def initialize_mcp_components():
         st.info("🚀 Starting MCP server initialization...")
 
         try:
-            # Initialize configuration
-            st.session_state.config = ConfigurationManager()
+            # Configuration and LLM client are shared across sessions
+            st.session_state.config = get_config()
 
             # Load servers configuration
             servers_config = ConfigurationManager.load_servers_config()
 
             # Initialize LLM client first
-            st.session_state.llm_client = StreamlitLLMClient(st.session_state.config.anthropic_api_key)
+            st.session_state.llm_client = get_llm_client(st.session_state.config.anthropic_api_key)
 
             # Initialize server registry
             st.session_state.server_registry = StreamlitMCPServerRegistry(
@@ -41,74 +81,82 @@ def initialize_mcp_components():
             status_text = st.empty()
             server_list_placeholder = st.empty()
 
-            # Initialize servers one by one with progress updates
             server_status = {}
             st.session_state.server_status = {}
             initialized_servers = []
 
-            for idx, (server_name, server_info) in enumerate(server_configs.items()):
-                current_progress = idx / total_servers
-                status_text.text(f"🔄 Initializing {server_name}... ({idx + 1}/{total_servers})")
-                progress_bar.progress(current_progress)
+            # Build all servers first, injecting API keys where needed
+            servers = []
+            for server_name, server_info in server_configs.items():
+                injector = _ENV_INJECTORS.get(server_name)
+                if injector:
+                    env_var, get_value = injector
+                    value = get_value(st.session_state.config)
+                    if value:
+                        # Work on a copy: the loaded config is cached and shared
+                        server_info = {**server_info, "env": {**server_info.get("env", {}), env_var: value}}
+
+                servers.append(StreamlitMCPServer(server_name, server_info, st.session_state.async_bridge))
+
+            # Start every server at once on the bridge loop; each one reports on
+            # `completed` as it finishes so the progress bar can follow along
+            status_text.text(f"🔄 Initializing {total_servers} servers...")
+            completed = queue.Queue()
+            init_future = st.session_state.async_bridge.submit(
+                _initialize_servers(servers, completed)
+            )
+            servers_by_name = {server.name: server for server in servers}
+            list_refresh_every = max(1, total_servers // 10)
 
+            for idx in range(total_servers):
                 try:
-                    # Import the server class and initialize individually
-                    from mcp_client.servers.connection import StreamlitMCPServer
-
-                    # Inject Google Maps API key if needed
-                    if server_name == "google-maps" and st.session_state.config.google_maps_api_key:
-                        if "env" not in server_info:
-                            server_info["env"] = {}
-                        server_info["env"]["GOOGLE_MAPS_API_KEY"] = st.session_state.config.google_maps_api_key
-
-                    # Inject Tavily API key if needed
-                    if server_name == "tavily" and st.session_state.config.tavily_api_key:
-                        if "env" not in server_info:
-                            server_info["env"] = {}
-                        server_info["env"]["TAVILY_API_KEY"] = st.session_state.config.tavily_api_key
-                    
-                    # Create and initialize server
-                    server = StreamlitMCPServer(server_name, server_info, st.session_state.async_bridge)
-                    success = server.initialize_sync()
-
-                    if success:
-                        # Add to registry manually
-                        st.session_state.server_registry.servers[server_name] = server
-                        st.session_state.server_registry.status[server_name] = True
-                        server_status[server_name] = True
-                        st.session_state.server_status[server_name] = "🟢 Connected"
-                        initialized_servers.append(f"✅ {server_name}")
-                        logger.info(f"Successfully initialized server: {server_name}")
-                    else:
-                        server_status[server_name] = False
-                        st.session_state.server_status[server_name] = "🔴 Failed"
-                        initialized_servers.append(f"❌ {server_name}")
-
-                except Exception as e:
+                    # Every server reports within its own timeout; the margin
+                    # only guards against the bridge loop itself failing
+                    server_name, success = completed.get(timeout=SERVER_INIT_TIMEOUT + 10)
+                except queue.Empty:
+                    logger.error("Timed out waiting for MCP servers to initialize")
+                    init_future.cancel()
+                    break
+
+                if success:
+                    # Add to registry manually
+                    st.session_state.server_registry.servers[server_name] = servers_by_name[server_name]
+                    st.session_state.server_registry.status[server_name] = True
+                    server_status[server_name] = True
+                    st.session_state.server_status[server_name] = "🟢 Connected"
+                    initialized_servers.append(f"✅ {server_name}")
+                    logger.info("Successfully initialized server: %s", server_name)
+                elif success is None:
+                    server_status[server_name] = False
+                    st.session_state.server_status[server_name] = "⏱️ Timed out"
+                    initialized_servers.append(f"⏱️ {server_name} (timed out after {SERVER_INIT_TIMEOUT}s)")
+                else:
                     server_status[server_name] = False
                     st.session_state.server_status[server_name] = "🔴 Failed"
                     initialized_servers.append(f"❌ {server_name}")
-                    logger.error(f"Failed to initialize server {server_name}: {e}")
 
-                # Update progress bar after each server
-                final_progress = (idx + 1) / total_servers
-                progress_bar.progress(final_progress)
+                # One progress update per completed server
+                progress_bar.progress((idx + 1) / total_servers)
 
-                # Show list of completed servers
-                with server_list_placeholder.container():
-                    st.write("**Server Status:**")
-                    for server_status_line in initialized_servers:
-                        st.write(server_status_line)
+                # Redraw the status list in batches, it grows with every server
+                if (idx + 1) % list_refresh_every == 0 or idx + 1 == total_servers:
+                    server_list_placeholder.markdown(
+                        "**Server Status:**\n\n" + "\n\n".join(initialized_servers)
+                    )
+
+            # Servers that never reported back timed out
+            for server_name in servers_by_name:
+                if server_name not in server_status:
+                    server_status[server_name] = False
+                    st.session_state.server_status[server_name] = "⏱️ Timed out"
 
             # Complete initialization
             progress_bar.progress(1.0)
             status_text.text("✅ All servers processed!")
 
-            # Clean up progress indicators after a moment
-            time.sleep(1)
-            progress_bar.empty()
-            status_text.empty()
-            server_list_placeholder.empty()
+            # The progress indicators are left in place: app.main() reruns the
+            # script after a successful init, which drops every element that
+            # isn't re-emitted, and on failure they show what went wrong
 
             # Check if any servers initialized successfully
             successful_servers = sum(1 for status in server_status.values() if status)
@@ -126,6 +174,9 @@ def initialize_mcp_components():
 
             # Get available tools
             st.session_state.available_tools = st.session_state.server_registry.get_all_tools_sync()
+            st.session_state.tools_schema = [
+                tool.anthropic_schema for tool in st.session_state.available_tools
+            ]
 
             st.session_state.initialized = True
             st.success("🎉 Initialization complete! Ready to chat.")
@@ -133,7 +184,7 @@ def initialize_mcp_components():
 
         except Exception as e:
             st.error(f"❌ Initialization failed: {e}")
-            logger.error(f"Failed to initialize MCP components: {e}")
+            logger.error("Failed to initialize MCP components: %s", e)
             return False
 
     return True
@@ -150,12 +201,13 @@ def cleanup_all_resources():
             # The cleanup will be handled by the registry itself
             st.session_state.server_registry = None
         except Exception as e:
-            logger.error(f"Error cleaning up server registry: {e}")
+            logger.error("Error cleaning up server registry: %s", e)
 
     # Reset state
     st.session_state.initialized = False
     st.session_state.servers = {}
     st.session_state.server_status = {}
     st.session_state.available_tools = []
+    st.session_state.tools_schema = []
 
     logger.info("Resource cleanup attempt finished.") 
\ No newline at end of file
@@ -1,104 +1,129 @@
 """Handles LLM response processing and tool calls for the Streamlit app."""
 
-import streamlit as st
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+import streamlit as st
 
+from mcp_client.llm.conversation import tool_result_text
 from utils.logging_config import get_logger
+
 from .session_state import SessionManager
 
 logger = get_logger(__name__)
 
 
-def execute_tool_call(tool_name: str, tool_input: Dict[str, Any]):
-    """Execute a tool call."""
-    try:
-        result = st.session_state.server_registry.execute_tool_sync(tool_name, tool_input)
+def log_tool_execution(tool_name: str, tool_input: Dict[str, Any], result: Any) -> None:
+    """Record a tool execution in the sidebar log."""
+    result_text = str(result)
+
+    # Bounded deque, old entries drop off
+    st.session_state.tool_call_count += 1
+    st.session_state.tool_execution_log.append({
+        "tool": tool_name,
+        "input": tool_input,
+        "result": result_text[:200] + "..." if len(result_text) > 200 else result_text,
+        "timestamp": datetime.now().isoformat()
+    })
 
-        # Log tool execution
-        st.session_state.tool_execution_log.append({
-            "tool": tool_name,
-            "input": tool_input,
-            "result": str(result)[:200] + "..." if len(str(result)) > 200 else str(result),
-            "timestamp": datetime.now().isoformat()
-        })
 
-        return result
+def execute_tool_calls(tool_uses: List[Any]) -> List[Any]:
+    """Execute the tool calls of one response concurrently.
+
+    Returns:
+        One result per tool call, in order. Failed calls yield an
+        "Error: ..." string instead of a result.
+    """
+    calls = [(content.name, content.input) for content in tool_uses]
+    try:
+        results = st.session_state.server_registry.execute_tools_sync(calls)
     except Exception as e:
-        logger.error(f"Error executing tool {tool_name}: {e}")
-        return f"Error: {e}"
+        results = [e] * len(calls)
+
+    outputs = []
+    for (tool_name, tool_input), result in zip(calls, results):
+        if isinstance(result, BaseException):
+            logger.error("Error executing tool %s: %s", tool_name, result)
+            outputs.append(f"Error: {result}")
+            continue
+
+        log_tool_execution(tool_name, tool_input, result)
+        outputs.append(result)
+
+    return outputs
 
 
 def process_llm_response(response, placeholder_for_live_update):
-    """Process LLM response and handle tool calls."""
-    assistant_content = []
-    tool_results = []
-
-    # Process response content
-    for content in response.content:
-        if content.type == "text":
-            assistant_content.append({"type": "text", "text": content.text})
-            with placeholder_for_live_update.container():
-                st.markdown(content.text)
-
-        elif content.type == "tool_use":
-            assistant_content.append({
-                "type": "tool_use",
-                "id": content.id,
-                "name": content.name,
-                "input": content.input
-            })
-
-            # Execute tool
-            with placeholder_for_live_update.container():
-                with st.status(f"🛠️ Executing {content.name}...", expanded=True) as status:
+    """Process LLM response and handle tool calls.
+
+    Loops until the LLM answers without requesting any tools; all tool calls
+    within a single response are executed concurrently.
+    """
+    while True:
+        assistant_content = []
+        tool_uses = []
+
+        # Process response content
+        for content in response.content:
+            if content.type == "text":
+                assistant_content.append({"type": "text", "text": content.text})
+                with placeholder_for_live_update.container():
+                    st.markdown(content.text)
+
+            elif content.type == "tool_use":
+                assistant_content.append({
+                    "type": "tool_use",
+                    "id": content.id,
+                    "name": content.name,
+                    "input": content.input
+                })
+                tool_uses.append(content)
+
+        # Add assistant message
+        if assistant_content:
+            SessionManager.add_message("assistant", assistant_content)
+
+        if not tool_uses:
+            break
+
+        # Execute tools
+        with placeholder_for_live_update.container():
+            statuses = []
+            for content in tool_uses:
+                status = st.status(f"🛠️ Executing {content.name}...", expanded=True)
+                with status:
                     st.json(content.input)
+                statuses.append(status)
+
+            results = execute_tool_calls(tool_uses)
 
-                    result = execute_tool_call(content.name, content.input)
-                    status.update(label=f"✅ {content.name} completed", state="complete")
-
-            # Format tool result
-            if hasattr(result, 'content') and isinstance(result.content, list):
-                text_parts = []
-                for content_item in result.content:
-                    if hasattr(content_item, 'text'):
-                        text_parts.append(content_item.text)
-                    else:
-                        text_parts.append(str(content_item))
-                result_text = " ".join(text_parts) if text_parts else str(result)
-            else:
-                result_text = str(result)
-
-            # Truncate very long results
-            if len(result_text) > 10000:
-                result_text = result_text[:1000] + f"... [Content truncated, original length: {len(result_text)}]"
-
-            tool_results.append({
+            for content, status in zip(tool_uses, statuses):
+                status.update(label=f"✅ {content.name} completed", state="complete")
+
+        tool_results = [
+            {
                 "type": "tool_result",
                 "tool_use_id": content.id,
-                "content": result_text
-            })
-
-    # Add assistant message
-    if assistant_content:
-        SessionManager.add_message("assistant", assistant_content)
+                "content": tool_result_text(result)
+            }
+            for content, result in zip(tool_uses, results)
+        ]
 
-    # If we have tool results, continue the conversation
-    if tool_results:
+        # Continue the conversation with the tool results
         SessionManager.add_message("user", tool_results, "tool_result")
 
-        # Get follow-up response
-        tools_schema = [tool.get_anthropic_schema() for tool in st.session_state.available_tools]
+        # Get follow-up response (schemas are built once at initialization)
+        tools_schema = st.session_state.tools_schema
 
-        # Clean messages before sending to API
-        clean_messages = st.session_state.chat_session.clean_messages_for_api(st.session_state.messages)
+        # Cleaned messages are maintained incrementally by SessionManager.add_message
+        clean_messages = st.session_state.chat_session.compress_tool_results(
+            st.session_state.clean_messages
+        )
 
         with st.spinner("🤔 Processing results..."):
-            follow_up_response = st.session_state.llm_client.get_response(
+            response = st.session_state.llm_client.get_response_with_streaming(
                 clean_messages,
                 tools=tools_schema,
-                system_prompt="You are a helpful assistant. Use tools when appropriate."
+                system_prompt="You are a helpful assistant. Use tools when appropriate.",
+                placeholder=placeholder_for_live_update,
             )
-
-        # Process follow-up response (recursively)
-        process_llm_response(follow_up_response, placeholder_for_live_update) 
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Process-wide resources shared across Streamlit sessions and reruns."""
+
+import atexit
+
+import streamlit as st
+
+from mcp_client.config.manager import ConfigurationManager
+from mcp_client.llm.client import StreamlitLLMClient
+
+from ..utils.async_bridge import AsyncBridge
+
+
+@st.cache_resource
+def get_async_bridge() -> AsyncBridge:
+    """Get the process-wide async bridge.
+
+    One event loop thread serves every session; `run_async` is thread-safe.
+    Cleanup is registered once, at process exit.
+    """
+    bridge = AsyncBridge()
+    atexit.register(bridge.cleanup)
+    return bridge
+
+
+@st.cache_resource
+def get_config() -> ConfigurationManager:
+    """Get the shared configuration manager."""
+    return ConfigurationManager()
+
+
+@st.cache_resource
+def get_llm_client(api_key: str) -> StreamlitLLMClient:
+    """Get the shared LLM client for the given API key."""
+    return StreamlitLLMClient(api_key)
@@ -1,11 +1,45 @@
 """Manages Streamlit session state."""
 
-import streamlit as st
-import atexit
-from datetime import datetime
+import time
+from collections import deque
 from typing import Any
 
-from ..utils.async_bridge import AsyncBridge
+import streamlit as st
+
+from mcp_client.llm.conversation import ChatSession
+
+from .resources import get_async_bridge
+
+# Only the most recent tool executions are kept for the sidebar log
+TOOL_LOG_MAX_ENTRIES = 500
+
+# Only the most recent messages are kept for the chat display
+DISPLAY_MESSAGES_MAX_ENTRIES = 1000
+
+
+def _to_markdown(content: Any) -> str:
+    """Flatten message content into the markdown shown in the chat history."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n\n".join(
+            item.get("text", "")
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "text"
+        )
+    return str(content)
+
+
+def _is_displayable(role: str, content: Any, message_type: str) -> bool:
+    """Whether a message belongs in the chat display (tool results don't)."""
+    if message_type != "message":
+        return False
+    if role != "user" or not isinstance(content, list):
+        return True
+    for item in content:
+        if isinstance(item, dict) and item.get("type") == "tool_result":
+            return False
+    return True
 
 
 class SessionManager:
@@ -17,46 +51,61 @@ class SessionManager:
         if "initialized" not in st.session_state:
             st.session_state.initialized = False
             st.session_state.messages = []
-            st.session_state.display_messages = []  # Separate display messages
+            st.session_state.clean_messages = []  # API view of `messages`, kept in sync
+            st.session_state.display_messages = deque(maxlen=DISPLAY_MESSAGES_MAX_ENTRIES)  # Separate display messages
             st.session_state.server_registry = None
             st.session_state.llm_client = None
             st.session_state.chat_session = None
-            st.session_state.async_bridge = AsyncBridge()
+            st.session_state.async_bridge = get_async_bridge()
             st.session_state.available_tools = []
+            st.session_state.tools_schema = []
             st.session_state.server_status = {}
             st.session_state.is_processing = False
-            st.session_state.tool_execution_log = []
+            st.session_state.tool_execution_log = deque(maxlen=TOOL_LOG_MAX_ENTRIES)
+            st.session_state.tool_call_count = 0
             st.session_state.conversation_summary = ""
             st.session_state.message_count = 0
             st.session_state.config = None
-            atexit.register(st.session_state.async_bridge.cleanup)
 
     @staticmethod
     def add_message(role: str, content: Any, message_type: str = "message"):
-        """Add a message to the conversation history."""
+        """Add a message to the conversation history.
+
+        Timestamps are stored as epoch seconds (`time.time()`), taken once per
+        message and shared by the API and display entries.
+        """
+        timestamp = time.time()
+
         # Add to internal messages (for API)
         st.session_state.messages.append({
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         })
+        st.session_state.clean_messages.append(
+            ChatSession.clean_message(st.session_state.messages[-1])
+        )
 
         # Add to display messages (for UI) - only for actual user/assistant messages
-        if message_type == "message" and not (role == "user" and isinstance(content, list) and
-                                             any(isinstance(item, dict) and item.get("type") == "tool_result"
-                                                 for item in content)):
+        if _is_displayable(role, content, message_type):
+            # Bounded deque, so the total is counted separately
+            st.session_state.message_count += 1
             st.session_state.display_messages.append({
                 "role": role,
                 "content": content,
-                "timestamp": datetime.now().isoformat(),
-                "type": message_type
+                "timestamp": timestamp,
+                "type": message_type,
+                # Pre-rendered markdown so the history loop doesn't inspect content
+                "_plain": _to_markdown(content),
             })
 
     @staticmethod
     def clear_conversation():
         """Clear the conversation history."""
         st.session_state.messages = []
-        st.session_state.display_messages = []
-        st.session_state.tool_execution_log = []
+        st.session_state.clean_messages = []
+        st.session_state.display_messages = deque(maxlen=DISPLAY_MESSAGES_MAX_ENTRIES)
+        st.session_state.tool_execution_log = deque(maxlen=TOOL_LOG_MAX_ENTRIES)
+        st.session_state.tool_call_count = 0
         st.session_state.conversation_summary = ""
         st.session_state.message_count = 0 
\ No newline at end of file
@@ -2,36 +2,65 @@
 
 import asyncio
 import logging
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from threading import Thread
+from typing import Any, Coroutine, Optional, TypeVar
+
+from utils.executor import create_executor
+
+T = TypeVar("T")
 
 
 class AsyncBridge:
     """Bridge between Streamlit's synchronous execution and MCP's async operations."""
     
-    def __init__(self):
-        self.loop = None
-        self.thread = None
+    def __init__(self) -> None:
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[Thread] = None
         self._start_loop()
     
-    def _start_loop(self):
+    def _start_loop(self) -> asyncio.AbstractEventLoop:
         """Start the async event loop in a separate thread."""
-        self.loop = asyncio.new_event_loop()
-        self.thread = Thread(target=self._run_loop, daemon=True)
+        loop = asyncio.new_event_loop()
+        # The loop shuts this executor down when it is closed
+        loop.set_default_executor(create_executor())
+        self.loop = loop
+        self.thread = Thread(target=self._run_loop, args=(loop,), daemon=True)
         self.thread.start()
+        return loop
     
-    def _run_loop(self):
+    def _run_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """Run the event loop."""
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_forever()
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
     
-    def run_async(self, coro):
-        """Execute a coroutine and return the result."""
-        if not self.loop or not self.thread.is_alive():
-            self._start_loop()
-        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        return future.result(timeout=30)  # 30 second timeout
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule a coroutine on the bridge loop without waiting for it."""
+        loop = self.loop
+        if not loop or not self.thread or not self.thread.is_alive():
+            loop = self._start_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run_async(self, coro: Coroutine[Any, Any, T], timeout: float | None = 30) -> T:
+        """Execute a coroutine and return the result.
+
+        Args:
+            coro: Coroutine to run on the bridge loop.
+            timeout: Seconds to wait for the result, or None to wait forever.
+
+        Raises:
+            TimeoutError: If the coroutine didn't finish in time. It is
+                cancelled so it doesn't keep running on the shared loop.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise
     
-    def cleanup(self):
+    def cleanup(self) -> None:
         """Clean up the event loop."""
         if self.loop and self.loop.is_running():
             logging.info("AsyncBridge: Stopping event loop...")
@@ -39,7 +68,12 @@ class AsyncBridge:
             if self.thread and self.thread.is_alive():
                 self.thread.join(timeout=5)
                 if self.thread.is_alive():
+                    # Closing a loop that is still running raises; leave it
+                    # to die with the daemon thread instead of failing shutdown
                     logging.warning("AsyncBridge: Thread did not join in time.")
+                    self.loop = None
+                    self.thread = None
+                    return
             self.loop.close()
             logging.info("AsyncBridge: Event loop stopped and closed.")
         self.loop = None
@@ -2,10 +2,13 @@
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from dotenv import load_dotenv
 
+# Parsed server configs keyed by path, with the (mtime_ns, size) they were read at
+_SERVERS_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
 
 class ConfigurationManager:
     """Manages configuration and environment variables for the MCP client."""
@@ -29,6 +32,10 @@ class ConfigurationManager:
         Args:
             file_path: Path to the JSON configuration file.
 
+        The parsed file is cached and only re-read when its modification time
+        or size changes, so the returned dict is shared between callers and
+        must not be mutated; copy entries before changing them.
+
         Returns:
             Dict containing server configuration.
 
@@ -36,8 +43,17 @@ class ConfigurationManager:
             FileNotFoundError: If configuration file doesn't exist.
             JSONDecodeError: If configuration file is invalid JSON.
         """
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _SERVERS_CONFIG_CACHE.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
         with open(file_path, "r") as f:
-            return json.load(f)
+            config = json.load(f)
+        _SERVERS_CONFIG_CACHE[file_path] = (signature, config)
+        return config
 
     @property
     def anthropic_api_key(self) -> str:
@@ -1,17 +1,140 @@
 """LLM client integration for MCP."""
 
-import logging
-from typing import Any, Dict, List, Optional
 import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 from anthropic import Anthropic, APIError
 
+# Cached token counts are dropped wholesale once this many are held
+TOKEN_CACHE_MAX_ENTRIES = 4096
+
+# Banners framing the token log blocks
+_ESTIMATES_BANNER = "="*20 + " Request Token Estimates " + "="*20
+_USAGE_BANNER = "="*20 + " Actual Token Usage " + "="*24
+_BANNER_RULE = "="*57
+
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None  # type: ignore[assignment]
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize an object to JSON for token counting."""
+    if orjson is not None:
+        try:
+            return cast(bytes, orjson.dumps(obj)).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+# One Anthropic client (and so one HTTP connection pool) per API key
+_anthropic_clients: Dict[str, Anthropic] = {}
+
+
+def _get_anthropic(api_key: str) -> Anthropic:
+    """Get the shared Anthropic client for an API key, creating it on first use."""
+    client = _anthropic_clients.get(api_key)
+    if client is None:
+        client = _anthropic_clients.setdefault(api_key, Anthropic(api_key=api_key))
+    return client
+
+
+_encoding: Any = None
+_encoding_unavailable = False
+
+
+def _get_encoding() -> Any:
+    """Get the shared tiktoken encoding, importing tiktoken on first use.
+
+    Returns:
+        The cl100k_base encoding, or None if tiktoken isn't installed.
+    """
+    global _encoding, _encoding_unavailable
+    if _encoding is None and not _encoding_unavailable:
+        try:
+            import tiktoken
+        except ImportError:
+            logging.warning("tiktoken not installed. Cannot estimate token count. Run 'pip install tiktoken'")
+            _encoding_unavailable = True
+            return None
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:  # The encoding file is downloaded on first use
+            logging.warning("Could not load tiktoken encoding, token counts are approximate: %s", e)
+            _encoding_unavailable = True
+            return None
+    return _encoding
+
+
+def _count_content_tokens(encoding: Any, content: Any) -> int:
+    """Count the tokens of a single message's content."""
+    if isinstance(content, str):
+        return len(encoding.encode_ordinary(content))
+
+    tokens = 0
+    if isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
+                continue
+            if item.get("type") == "text" and item.get("text"):
+                tokens += len(encoding.encode_ordinary(item["text"]))
+            elif item.get("type") == "tool_use":
+                tokens += len(encoding.encode_ordinary(item.get("name", "")))
+                tokens += len(encoding.encode_ordinary(_to_json(item.get("input", {}))))
+            elif item.get("type") == "tool_result" and item.get("content"):
+                tokens += len(encoding.encode_ordinary(_to_json(item.get("content"))))
+    return tokens
+
+
+def estimate_content_tokens(content: Any) -> int:
+    """Roughly estimate the tokens of a single message's content.
+
+    Counts about four characters per token over the same fields as
+    `_count_content_tokens`, without encoding anything; good enough for
+    budgeting the history, not for reporting.
+    """
+    if isinstance(content, str):
+        return len(content) // 4
+
+    chars = 0
+    if isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
+                continue
+            if item.get("type") == "text" and item.get("text"):
+                chars += len(item["text"])
+            elif item.get("type") == "tool_use":
+                chars += len(item.get("name", "")) + len(_to_json(item.get("input", {})))
+            elif item.get("type") == "tool_result" and item.get("content"):
+                tool_content = item["content"]
+                chars += len(tool_content) if isinstance(tool_content, str) else len(_to_json(tool_content))
+    return chars // 4
+
 
 class LLMClient:
     """Client for interacting with Anthropic's Claude API."""
 
     def __init__(self, api_key: str) -> None:
-        self.client = Anthropic(api_key=api_key)
+        self.client = _get_anthropic(api_key)
+        # Token counts keyed by id() of message content / tools list. The object
+        # itself is kept alongside so a recycled id() is never mistaken for a hit.
+        self._token_cache: Dict[int, Tuple[Any, int]] = {}
+
+    def _cached_token_count(self, obj: Any, count: Callable[[], int]) -> int:
+        """Return the token count for `obj`, computing it only on first sight."""
+        cached = self._token_cache.get(id(obj))
+        if cached is not None and cached[0] is obj:
+            return cached[1]
+
+        tokens = count()
+        if len(self._token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+            self._token_cache.clear()
+        self._token_cache[id(obj)] = (obj, tokens)
+        return tokens
 
     def _estimate_token_count(
         self,
@@ -19,14 +142,14 @@ class LLMClient:
         tools: Optional[List[Dict[str, Any]]] = None,
         system_prompt: Optional[str] = None,
     ) -> Dict[str, int]:
-        """Estimate token count for a request to the Claude API using tiktoken."""
-        try:
-            import tiktoken
-        except ImportError:
-            logging.warning("tiktoken not installed. Cannot estimate token count. Run 'pip install tiktoken'")
-            return {}
+        """Estimate token count for a request to the Claude API using tiktoken.
 
-        encoding = tiktoken.get_encoding("cl100k_base")
+        Message contents and the tools list are shared between turns, so their
+        counts are cached and only new messages are encoded.
+        """
+        encoding = _get_encoding()
+        if encoding is None:
+            return {}
         
         token_counts = {
             "system_prompt": 0,
@@ -35,36 +158,81 @@ class LLMClient:
         }
 
         if system_prompt:
-            token_counts["system_prompt"] = len(encoding.encode(system_prompt))
+            token_counts["system_prompt"] = len(encoding.encode_ordinary(system_prompt))
 
         if tools:
-            token_counts["tools"] = len(encoding.encode(json.dumps(tools)))
+            token_counts["tools"] = self._cached_token_count(
+                tools, lambda: len(encoding.encode_ordinary(_to_json(tools)))
+            )
 
         messages_tokens = 0
         for message in messages:
             if message.get("role"):
-                messages_tokens += len(encoding.encode(message["role"]))
+                messages_tokens += len(encoding.encode_ordinary(message["role"]))
             
             content = message.get("content")
-            if isinstance(content, str):
-                messages_tokens += len(encoding.encode(content))
-            elif isinstance(content, list):
-                for item in content:
-                    if not isinstance(item, dict):
-                        continue
-                    if item.get("type") == "text" and item.get("text"):
-                        messages_tokens += len(encoding.encode(item["text"]))
-                    elif item.get("type") == "tool_use":
-                        messages_tokens += len(encoding.encode(item.get("name", "")))
-                        messages_tokens += len(encoding.encode(json.dumps(item.get("input", {}))))
-                    elif item.get("type") == "tool_result" and item.get("content"):
-                        messages_tokens += len(encoding.encode(json.dumps(item.get("content"))))
+            if content is not None:
+                messages_tokens += self._cached_token_count(
+                    content, lambda: _count_content_tokens(encoding, content)
+                )
         
         token_counts["messages"] = messages_tokens
         token_counts["total"] = sum(token_counts.values())
 
         return token_counts
 
+    def _log_token_estimates(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        system_prompt: Optional[str],
+    ) -> None:
+        """Estimate and log the token count of a request before sending it.
+
+        Skipped entirely when INFO is disabled, as the estimate is only logged.
+        """
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
+
+        token_estimates = self._estimate_token_count(messages, tools, system_prompt)
+        if token_estimates:
+            logging.info(_ESTIMATES_BANNER)
+            logging.info("Total estimated INPUT tokens: %s", token_estimates['total'])
+            logging.info("  - System Prompt:      %s tokens", token_estimates['system_prompt'])
+            logging.info("  - Tools Definition:   %s tokens", token_estimates['tools'])
+            logging.info("  - Messages History:   %s tokens", token_estimates['messages'])
+            logging.info(_BANNER_RULE)
+
+    @staticmethod
+    def _log_usage(response: Any) -> None:
+        """Log the actual token usage reported by the API."""
+        if response.usage and logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(_USAGE_BANNER)
+            logging.info("Actual INPUT tokens:  %s", response.usage.input_tokens)
+            logging.info("Actual OUTPUT tokens: %s", response.usage.output_tokens)
+            logging.info(_BANNER_RULE)
+
+    @staticmethod
+    def _build_request(
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        system_prompt: Optional[str],
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments for a Messages API request."""
+        kwargs: Dict[str, Any] = {
+            "model": "claude-3-5-haiku-latest",
+            "max_tokens": 4096,
+            "messages": messages,
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+
+        if system_prompt:
+            kwargs["system"] = system_prompt
+
+        return kwargs
+
     def get_response(
         self,
         messages: List[Dict[str, Any]],
@@ -85,40 +253,56 @@ class LLMClient:
             APIError: If API call fails.
         """
         try:
-            # Estimate and log token count before sending
-            token_estimates = self._estimate_token_count(messages, tools, system_prompt)
-            if token_estimates:
-                logging.info("="*20 + " Request Token Estimates " + "="*20)
-                logging.info(f"Total estimated INPUT tokens: {token_estimates['total']}")
-                logging.info(f"  - System Prompt:      {token_estimates['system_prompt']} tokens")
-                logging.info(f"  - Tools Definition:   {token_estimates['tools']} tokens")
-                logging.info(f"  - Messages History:   {token_estimates['messages']} tokens")
-                logging.info("="*57)
-
-            kwargs = {
-                "model": "claude-3-5-haiku-latest",
-                "max_tokens": 4096,
-                "messages": messages,
-            }
-
-            if tools:
-                kwargs["tools"] = tools
-
-            if system_prompt:
-                kwargs["system"] = system_prompt
-
-            response = self.client.messages.create(**kwargs)
-
-            if response.usage:
-                logging.info("="*20 + " Actual Token Usage " + "="*24)
-                logging.info(f"Actual INPUT tokens:  {response.usage.input_tokens}")
-                logging.info(f"Actual OUTPUT tokens: {response.usage.output_tokens}")
-                logging.info("="*57)
+            self._log_token_estimates(messages, tools, system_prompt)
 
+            response = self.client.messages.create(
+                **self._build_request(messages, tools, system_prompt)
+            )
+
+            self._log_usage(response)
             return response
 
         except APIError as e:
-            logging.error(f"Error calling Anthropic API: {e}")
+            logging.error("Error calling Anthropic API: %s", e)
+            raise
+
+    def stream_response(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        system_prompt: Optional[str] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> Any:
+        """Get response from Claude API, streaming text as it is generated.
+
+        Args:
+            messages: List of conversation messages.
+            tools: Optional list of available tools.
+            system_prompt: Optional system prompt.
+            on_text: Optional callback invoked with each text delta.
+
+        Returns:
+            The final Claude API message, same shape as `get_response`.
+
+        Raises:
+            APIError: If API call fails.
+        """
+        try:
+            self._log_token_estimates(messages, tools, system_prompt)
+
+            with self.client.messages.stream(
+                **self._build_request(messages, tools, system_prompt)
+            ) as stream:
+                if on_text is not None:
+                    for text in stream.text_stream:
+                        on_text(text)
+                response = stream.get_final_message()
+
+            self._log_usage(response)
+            return response
+
+        except APIError as e:
+            logging.error("Error calling Anthropic API: %s", e)
             raise
 
 
@@ -130,9 +314,27 @@ class StreamlitLLMClient(LLMClient):
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]] = None,
         system_prompt: Optional[str] = None,
+        placeholder: Any = None,
     ) -> Any:
-        """Get response with potential streaming support.
-        
-        Note: This is a placeholder for future streaming implementation.
+        """Get response while painting text into a Streamlit placeholder.
+
+        Args:
+            messages: List of conversation messages.
+            tools: Optional list of available tools.
+            system_prompt: Optional system prompt.
+            placeholder: Optional Streamlit element (e.g. `st.empty()`) that is
+                updated with the accumulated text as it streams in.
+
+        Returns:
+            The final Claude API message.
         """
-        return self.get_response(messages, tools, system_prompt) 
\ No newline at end of file
+        if placeholder is None:
+            return self.stream_response(messages, tools, system_prompt)
+
+        streamed_text: List[str] = []
+
+        def on_text(text: str) -> None:
+            streamed_text.append(text)
+            placeholder.markdown("".join(streamed_text))
+
+        return self.stream_response(messages, tools, system_prompt, on_text=on_text)
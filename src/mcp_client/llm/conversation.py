@@ -1,13 +1,118 @@
 """Conversation management for MCP client."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from mcp.types import TextContent
+from mcp.types import EmbeddedResource, ImageContent, TextContent
 
-from .client import LLMClient
 from mcp_client.servers.registry import MCPServerRegistry
 
+from .client import LLMClient, estimate_content_tokens
+
+_NL = "\n"
+
+_TOOL_USE = "tool_use"
+_TOOL_RESULT = "tool_result"
+
+# Bit flags describing which tool blocks a message's content holds
+_HAS_TOOL_USE = 1
+_HAS_TOOL_RESULT = 2
+
+
+def _classify(content: Any) -> int:
+    """Tool-block flags (`_HAS_TOOL_USE` | `_HAS_TOOL_RESULT`) of a message's content."""
+    flags = 0
+    if isinstance(content, list):
+        for item in content:
+            if isinstance(item, dict):
+                item_type = item.get("type")
+                if item_type == _TOOL_USE:
+                    flags |= _HAS_TOOL_USE
+                elif item_type == _TOOL_RESULT:
+                    flags |= _HAS_TOOL_RESULT
+    return flags
+
+
+# Tool results longer than this are truncated by the interfaces to a short preview
+MAX_TOOL_RESULT_CHARS = 10_000
+TRUNCATED_RESULT_CHARS = 1000
+
+# Text extraction per MCP content type, looked up by exact type
+_CONTENT_HANDLERS: Dict[type, Callable[[Any], str]] = {
+    TextContent: attrgetter("text"),
+    # Images are not forwarded, just indicate one was returned
+    ImageContent: lambda item: "[Image content returned]",
+    EmbeddedResource: lambda item: f"[Resource: {item.resource.uri}]",
+}
+
+# Only the most recent tool rounds are sent in full, older results as a digest
+KEEP_FULL_TOOL_RESULTS = 3
+# Results shorter than this are cheaper to send than their digest
+COMPRESS_MIN_CHARS = 200
+DIGEST_LINE_CHARS = 60
+
+# Token budget for the history kept when pruning: the results sent in full at
+# their largest (about four characters per token), and as much again for the
+# rest of the conversation
+MAX_TOKENS_TO_KEEP = 2 * KEEP_FULL_TOOL_RESULTS * MAX_TOOL_RESULT_CHARS // 4
+
+# Seconds cleanup waits for queued memory writes to be flushed
+MEMORY_FLUSH_TIMEOUT = 10
+
+_SYSTEM_PROMPT = (
+    "You are a helpful assistant. Use the available tools when appropriate. "
+    "When you use a tool, the system will provide its output. "
+    "Based on the tool output, provide a natural language response to the user."
+)
+
+
+def truncate_result_text(parts: Iterable[str]) -> str:
+    """Join the parts of a tool result, truncating it over `MAX_TOOL_RESULT_CHARS`.
+
+    Parts are only consumed until the cap is hit, so huge payloads are never
+    fully joined.
+    """
+    text_parts: List[str] = []
+    total = 0
+    for piece in parts:
+        # Account for the joining space between parts
+        total += len(piece) + (1 if text_parts else 0)
+        text_parts.append(piece)
+        if total > MAX_TOOL_RESULT_CHARS:
+            return (
+                " ".join(text_parts)[:TRUNCATED_RESULT_CHARS]
+                + f"... [Content truncated, original length exceeds {MAX_TOOL_RESULT_CHARS}]"
+            )
+    return " ".join(text_parts)
+
+
+def tool_result_text(result: Any) -> str:
+    """Text sent back to the LLM for a tool result, truncated like `truncate_result_text`.
+
+    Large payloads (like base64 images) are never fully joined; only enough
+    of the content is collected to build the truncated preview.
+    """
+    content = getattr(result, "content", result)
+    if not isinstance(content, list):
+        return truncate_result_text([str(content)])
+
+    return truncate_result_text(
+        _CONTENT_HANDLERS.get(type(content_item), str)(content_item)
+        for content_item in content
+    )
+
+
+def _digest_tool_result(tool_name: str, text: str) -> str:
+    """One-line digest of a tool result: status, size, first and last line."""
+    lines = text.strip().splitlines() or [""]
+    status = "ERROR" if text.startswith("Error") else "OK"
+    return (
+        f"[{tool_name}] {status} ({len(text)} chars) | "
+        f"{lines[0][:DIGEST_LINE_CHARS]} → {lines[-1][-DIGEST_LINE_CHARS:]}"
+    )
+
 
 class ChatSession:
     """Orchestrates the interaction between user, LLM, and MCP tools."""
@@ -15,33 +120,197 @@ class ChatSession:
     def __init__(self, server_registry: MCPServerRegistry, llm_client: LLMClient) -> None:
         self.server_registry = server_registry
         self.llm_client = llm_client
-        self.max_messages_to_keep = 10  # Reduced to keep fewer messages in context
+        self.max_messages_to_keep = 10  # Used when pruning by message count
+        # Token budget for kept history; None prunes by message count instead
+        self.max_tokens_to_keep: Optional[int] = MAX_TOKENS_TO_KEEP
         self.conversation_summary = ""  # Store conversation summary
         self.message_count = 0  # Track total messages for periodic summarization
+        self._api_messages: List[Dict[str, Any]] = []  # Cleaned view of the history
+        # Tool-block flags of each message in the history, see `record_message`
+        self._content_flags: List[int] = []
+        # Newest message already folded into conversation_summary
+        self._last_summarized_message: Optional[Dict[str, Any]] = None
+        # Digested copies of messages, see `compress_tool_results`
+        self._compressed_messages: Dict[int, Tuple[Dict[str, Any], Tuple, Dict[str, Any]]] = {}
+        # (summary, formatted preamble) for the context prepended when pruning
+        self._preamble_cache: Tuple[str, str] = ("", "")
+        # Memory writes are queued and issued by a background task
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def clean_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the 'role' and 'content' fields of a message."""
+        return {
+            "role": msg["role"],
+            "content": msg["content"]
+        }
+
+    def record_message(self, message: Dict[str, Any]) -> None:
+        """Classify a message once, as it is added to the history."""
+        self._content_flags.append(_classify(message.get("content")))
+
+    def _content_flags_for(self, messages: List[Dict[str, Any]]) -> List[int]:
+        """Tool-block flags for `messages`, from the cache when it tracks this history."""
+        if len(self._content_flags) == len(messages):
+            return self._content_flags
+        return [_classify(msg.get("content")) for msg in messages]
+
+    def _keep_from(self, messages: List[Dict[str, Any]]) -> int:
+        """Index of the oldest message that fits the token budget (or message count)."""
+        if self.max_tokens_to_keep is None:
+            return max(0, len(messages) - self.max_messages_to_keep)
+
+        # Walk back from the newest message until the budget is spent; the
+        # newest message is always kept
+        tokens = [estimate_content_tokens(msg.get("content")) for msg in messages]
+        keep_from = len(messages) - 1
+        total = tokens[keep_from] if messages else 0
+        while keep_from > 0 and total + tokens[keep_from - 1] <= self.max_tokens_to_keep:
+            keep_from -= 1
+            total += tokens[keep_from]
+        return max(keep_from, 0)
 
     def clean_messages_for_api(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Clean messages by removing extra fields that aren't expected by Anthropic API."""
-        cleaned_messages = []
-        for msg in messages:
-            # Only keep 'role' and 'content' fields
-            cleaned_msg = {
-                "role": msg["role"],
-                "content": msg["content"]
-            }
-            cleaned_messages.append(cleaned_msg)
-        return cleaned_messages
+        return [self.clean_message(msg) for msg in messages]
+
+    def compress_tool_results(
+        self, messages: List[Dict[str, Any]], keep_last_n: int = KEEP_FULL_TOOL_RESULTS
+    ) -> List[Dict[str, Any]]:
+        """Shrink tool results before they are sent to the API.
+
+        Results outside the last `keep_last_n` tool rounds are replaced with a
+        one-line digest, and a result repeating one already sent in full is
+        replaced by a pointer back to it, so earlier messages are never
+        rewritten for a later one. The newest round is always kept in full.
+
+        `messages` is not modified: rewritten messages are shallow copies,
+        reused across calls so repeated sends share the same objects.
+
+        Args:
+            messages: Cleaned messages about to be sent to the API.
+            keep_last_n: Number of most recent tool rounds kept in full.
+
+        Returns:
+            The messages to send; `messages` itself when nothing was rewritten.
+        """
+        tool_names: Dict[str, str] = {}
+        results = []  # (message index, block index, block) of every tool result
+        for i, msg in enumerate(messages):
+            content = msg["content"]
+            if isinstance(content, list):
+                for j, item in enumerate(content):
+                    if isinstance(item, dict):
+                        item_type = item.get("type")
+                        if item_type == _TOOL_USE:
+                            tool_names[item.get("id", "")] = item.get("name", "tool")
+                        elif item_type == _TOOL_RESULT:
+                            results.append((i, j, item))
+
+        rewrites: Dict[int, Dict[int, str]] = {}  # message index -> {block index: new content}
+        first: Dict[Tuple[str, str], str] = {}  # (tool name, result) -> tool_use_id sent in full
+        # A round is one user message of results; parallel calls share it
+        rounds = sorted({i for i, _, _ in results})
+        keep_rounds = max(keep_last_n, 1)
+        digest_before = rounds[-keep_rounds] if len(rounds) >= keep_rounds else 0
+        for i, j, item in results:
+            text = item.get("content")
+            if not isinstance(text, str) or len(text) <= COMPRESS_MIN_CHARS:
+                continue
+
+            tool_use_id = item.get("tool_use_id", "")
+            tool_name = tool_names.get(tool_use_id, "tool")
+            first_id = first.get((tool_name, text))
+            if first_id is not None:
+                new_text = f"[identical to tool_result {first_id}]"
+            elif i < digest_before:
+                new_text = _digest_tool_result(tool_name, text)
+            else:
+                # Only copies sent in full are pointed at, never a digest
+                first[(tool_name, text)] = tool_use_id
+                continue
+            rewrites.setdefault(i, {})[j] = new_text
+
+        if not rewrites:
+            return messages
+
+        compressed_messages = {}
+        result = list(messages)
+        for i, blocks in rewrites.items():
+            msg = messages[i]
+            signature = tuple(sorted(blocks.items()))
+            cached = self._compressed_messages.get(id(msg))
+            if cached is None or cached[0] is not msg or cached[1] != signature:
+                new_content = list(msg["content"])
+                for j, new_text in blocks.items():
+                    new_content[j] = {**new_content[j], "content": new_text}
+                cached = (msg, signature, {**msg, "content": new_content})
+
+            compressed_messages[id(msg)] = cached
+            result[i] = cached[2]
+
+        # Only messages still in the history stay cached
+        self._compressed_messages = compressed_messages
+        return result
+
+    @property
+    def api_messages(self) -> List[Dict[str, Any]]:
+        """Cleaned view of the history, kept in sync by `append_message`."""
+        return self._api_messages
+
+    def append_message(self, messages: List[Dict[str, Any]], message: Dict[str, Any]) -> None:
+        """Append a message to the history and to the cleaned API view."""
+        messages.append(message)
+        self._api_messages.append(self.clean_message(message))
+        self.record_message(message)
+
+    def reset_api_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """Rebuild the cleaned API view after the history was replaced or pruned."""
+        self._api_messages = [self.clean_message(msg) for msg in messages]
+        self._content_flags = [_classify(msg.get("content")) for msg in messages]
 
     async def cleanup_servers(self) -> None:
-        """Clean up all servers properly."""
+        """Clean up all servers properly, flushing queued memory writes first."""
+        if self._writer_task is not None and not self._writer_task.done():
+            try:
+                await asyncio.wait_for(self._write_queue.join(), MEMORY_FLUSH_TIMEOUT)
+            except TimeoutError:
+                logging.warning("Timed out flushing memory writes")
+            self._writer_task.cancel()
         await self.server_registry.cleanup_all()
 
     async def store_in_memory(self, key: str, value: str) -> None:
-        """Store data in memory server if available."""
-        try:
-            await self.server_registry.execute_tool("store", {"key": key, "value": value})
-            logging.info(f"Stored in memory: {key}")
-        except Exception as e:
-            logging.warning(f"Failed to store in memory: {e}")
+        """Store data in memory server if available.
+
+        The write is queued and issued in the background, so the caller
+        doesn't wait on the memory server.
+        """
+        self._write_queue.put_nowait((key, value))
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._drain_writes())
+
+    async def _drain_writes(self) -> None:
+        """Issue queued memory writes, coalescing bursts to the latest value per key."""
+        while True:
+            key, value = await self._write_queue.get()
+            batch = {key: value}
+            received = 1
+            while not self._write_queue.empty():
+                key, value = self._write_queue.get_nowait()
+                batch[key] = value
+                received += 1
+
+            try:
+                for key, value in batch.items():
+                    try:
+                        await self.server_registry.execute_tool("store", {"key": key, "value": value})
+                        logging.info("Stored in memory: %s", key)
+                    except Exception as e:
+                        logging.warning("Failed to store in memory: %s", e)
+            finally:
+                for _ in range(received):
+                    self._write_queue.task_done()
 
     async def retrieve_from_memory(self, key: str) -> Optional[str]:
         """Retrieve data from memory server if available."""
@@ -56,10 +325,30 @@ class ChatSession:
         return None
 
     async def summarize_conversation(self, messages: List[Dict[str, Any]]) -> str:
-        """Create a summary of the conversation to reduce tokens."""
-        # Extract key points from the conversation
+        """Fold the messages added since the last summary into `conversation_summary`.
+
+        Side effect: `conversation_summary` is updated in place, so callers
+        don't need to store the returned summary themselves.
+
+        Only new messages (at most the last 10) are sent to the LLM, together
+        with the current summary; when nothing new has been said the current
+        summary is returned without an API call.
+
+        Returns:
+            The updated summary, or "" if summarization failed.
+        """
+        # Walk back to the last message already covered by the summary
+        start = len(messages)
+        while start > 0 and messages[start - 1] is not self._last_summarized_message:
+            start -= 1
+        new_messages = messages[max(start, len(messages) - 10):]
+
+        if not new_messages:
+            return self.conversation_summary
+
+        # Extract key points from the new messages
         conversation_text = []
-        for msg in messages[-10:]:  # Last 10 messages
+        for msg in new_messages:
             role = msg["role"]
             content = msg.get("content", "")
             if isinstance(content, str):
@@ -71,127 +360,122 @@ class ChatSession:
                         text_parts.append(item.get("text", ""))
                 if text_parts:
                     conversation_text.append(f"{role}: {' '.join(text_parts)}")
-        
+
         if not conversation_text:
-            return ""
-        
+            # Only tool traffic since the last summary, nothing to add
+            self._last_summarized_message = messages[-1]
+            return self.conversation_summary
+
         # Create a summary prompt
-        summary_prompt = f"""Summarize the following conversation in 2-3 sentences, focusing on key information and context:
+        if self.conversation_summary:
+            summary_prompt = f"""Update this conversation summary with the new turns below, in 2-3 sentences, focusing on key information and context:
 
-{chr(10).join(conversation_text)}
+{self.conversation_summary}
+
+New turns:
+{_NL.join(conversation_text)}
 
 Summary:"""
-        
+        else:
+            summary_prompt = f"""Summarize the following conversation in 2-3 sentences, focusing on key information and context:
+
+{_NL.join(conversation_text)}
+
+Summary:"""
+
         try:
-            # Clean messages before sending to API
-            clean_messages = self.clean_messages_for_api([{"role": "user", "content": summary_prompt}])
             response = self.llm_client.get_response(
-                clean_messages,
+                [{"role": "user", "content": summary_prompt}],
                 system_prompt="You are a helpful assistant that creates concise summaries."
             )
             if response.content and response.content[0].type == "text":
-                return response.content[0].text
+                self.conversation_summary = response.content[0].text
+                self._last_summarized_message = messages[-1]
+                return self.conversation_summary
         except Exception as e:
             logging.warning(f"Failed to create summary: {e}")
-        
+
         return ""
 
     def prune_messages_with_summary(self, messages: List[Dict[str, Any]], summary: str = "") -> List[Dict[str, Any]]:
-        """Prune messages while maintaining context through summary and keeping tool pairs intact."""
-        if len(messages) <= self.max_messages_to_keep:
+        """Prune messages while maintaining context through summary and keeping tool pairs intact.
+
+        Messages are kept newest first within `max_tokens_to_keep`, or the
+        last `max_messages_to_keep` when no token budget is set. The current
+        turn, from the latest plain user message on, is always kept.
+        """
+        flags = self._content_flags_for(messages)
+
+        # Never cut into the current turn: the latest plain user message is
+        # the question the rest of the history is answering
+        turn_start = len(messages) - 1
+        while turn_start > 0 and (messages[turn_start]["role"] != "user" or flags[turn_start] & _HAS_TOOL_RESULT):
+            turn_start -= 1
+
+        keep_from = min(self._keep_from(messages), max(turn_start, 0))
+        if keep_from == 0:
             return messages
-        
-        # First, identify tool_use/tool_result pairs that must be kept together
-        tool_pairs = []
-        for i in range(len(messages) - 1):
-            if messages[i]["role"] == "assistant":
-                # Check if this assistant message has tool_use blocks
-                content = messages[i].get("content", [])
-                if isinstance(content, list):
-                    has_tool_use = any(
-                        isinstance(item, dict) and item.get("type") == "tool_use"
-                        for item in content
-                    )
-                    if has_tool_use and i + 1 < len(messages):
-                        # Check if next message is user with tool_result
-                        next_content = messages[i + 1].get("content", [])
-                        if isinstance(next_content, list) and messages[i + 1]["role"] == "user":
-                            has_tool_result = any(
-                                isinstance(item, dict) and item.get("type") == "tool_result"
-                                for item in content
-                            )
-                            if has_tool_result:
-                                tool_pairs.append((i, i + 1))
-        
-        # Keep only recent messages, but ensure we don't break tool pairs
-        keep_from = max(0, len(messages) - self.max_messages_to_keep)
-        
-        # Adjust keep_from to not break any tool pairs
-        for assistant_idx, user_idx in tool_pairs:
-            if assistant_idx < keep_from <= user_idx:
-                # We would break this pair, so include both messages
-                keep_from = assistant_idx
-        
+
+        # Don't cut between a tool_use and its tool_result
+        if (
+            keep_from > 0
+            and flags[keep_from - 1] & _HAS_TOOL_USE
+            and flags[keep_from] & _HAS_TOOL_RESULT
+            and messages[keep_from - 1]["role"] == "assistant"
+            and messages[keep_from]["role"] == "user"
+        ):
+            keep_from -= 1
+
+        # Ensure we start with a user message, unless the leading assistant
+        # message opens a tool pair
+        while keep_from < len(messages) and messages[keep_from]["role"] == "assistant":
+            if (
+                flags[keep_from] & _HAS_TOOL_USE
+                and keep_from + 1 < len(messages)
+                and messages[keep_from + 1]["role"] == "user"
+            ):
+                break
+            keep_from += 1
+
         pruned = messages[keep_from:]
-        
-        # Ensure we start with a user message (unless it would break a tool pair)
-        while pruned and pruned[0]["role"] == "assistant":
-            # Check if removing this assistant message would break a tool pair
-            first_msg_has_tool_use = False
+
+        # If we have a summary and the first message is a plain user message, prepend context
+        if summary and pruned and pruned[0]["role"] == "user" and not flags[keep_from] & _HAS_TOOL_RESULT:
+            if self._preamble_cache[0] != summary:
+                self._preamble_cache = (summary, f"[Previous conversation context: {summary}]")
+            preamble = self._preamble_cache[1]
+
             content = pruned[0].get("content", [])
-            if isinstance(content, list):
-                first_msg_has_tool_use = any(
-                    isinstance(item, dict) and item.get("type") == "tool_use"
-                    for item in content
-                )
-            
-            if first_msg_has_tool_use and len(pruned) > 1 and pruned[1]["role"] == "user":
-                # This assistant message has tool_use and next is user (likely with tool_result)
-                # Keep both to maintain the pair
-                break
+            new_content: str | List[Dict[str, Any]]
+            if isinstance(content, str):
+                new_content = f"{preamble}\n\n{content}"
             else:
-                # Safe to remove this assistant message
-                pruned.pop(0)
-        
-        # If we have a summary and the first message is a user message, prepend context
-        if summary and pruned and pruned[0]["role"] == "user":
-            # Only modify if it's not a tool_result message
-            content = pruned[0].get("content", [])
-            is_tool_result = isinstance(content, list) and any(
-                isinstance(item, dict) and item.get("type") == "tool_result"
-                for item in content
-            )
-            
-            if not is_tool_result:
-                if isinstance(content, str):
-                    new_content = f"[Previous conversation context: {summary}]\n\n{content}"
-                else:
-                    new_content = f"[Previous conversation context: {summary}]\n\n{str(content)}"
-                
-                context_message = {
-                    "role": "user",
-                    "content": new_content
-                }
-                pruned[0] = context_message
-        
+                # Keep the block list intact rather than flattening it to its repr
+                new_content = [{"type": "text", "text": preamble}, *content]
+
+            pruned[0] = {
+                "role": "user",
+                "content": new_content
+            }
+
         # Validate that all messages have content
-        pruned = [msg for msg in pruned if msg.get("content")]
-        
-        return pruned
+        return [msg for msg in pruned if msg.get("content")]
 
-    async def get_system_prompt(self) -> str:
+    def get_system_prompt(self) -> str:
         """Get system prompt for the conversation."""
-        return (
-            "You are a helpful assistant. Use the available tools when appropriate. "
-            "When you use a tool, the system will provide its output. "
-            "Based on the tool output, provide a natural language response to the user."
-        )
+        return _SYSTEM_PROMPT
 
     async def initialize_conversation(self) -> List[Dict[str, Any]]:
         """Initialize a new conversation with context from memory if available."""
         messages: List[Dict[str, Any]] = []
+        self._api_messages = []
+        self._content_flags = []
         
-        # Try to retrieve previous conversation context from memory
+        # Try to retrieve previous conversation context from memory, unless
+        # this session already has it (e.g. on a reconnect)
+        if self.conversation_summary:
+            return messages
+
         previous_summary = await self.retrieve_from_memory("conversation_summary")
         if previous_summary:
             logging.info(f"Retrieved previous context: {previous_summary[:100]}...")
@@ -3,17 +3,55 @@
 import asyncio
 import logging
 import os
+import random
 import shutil
+import time
 from contextlib import AsyncExitStack
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+# Seconds a synchronous tool call may take before it is cancelled
+TOOL_EXECUTION_TIMEOUT = 120
+
+# Seconds a server's tool list is reused before it is fetched again
+TOOLS_CACHE_TTL = 30.0
+
+# How the stdio transport reports a dropped stream; retried after reconnecting
+_STREAM_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+# Errors worth retrying a tool call for; anything else fails immediately.
+# OSError covers ConnectionError and TimeoutError.
+_RETRIABLE = (OSError, *_STREAM_ERRORS)
+
+_base_env: Optional[Dict[str, str]] = None
+
+
+def _get_base_env() -> Dict[str, str]:
+    """Snapshot of the process environment that server envs are layered on.
+
+    Taken on first use rather than at import, so variables loaded from
+    `.env` by ConfigurationManager are included.
+    """
+    global _base_env
+    if _base_env is None:
+        _base_env = dict(os.environ)
+    return _base_env
+
 
 class MCPServer:
     """Manages MCP server connections and tool execution."""
 
+    __slots__ = (
+        "_cleanup_lock", "_tools_cache", "config", "exit_stack", "name", "session", "stdio_context"
+    )
+
     def __init__(self, name: str, config: Dict[str, Any]) -> None:
         self.name: str = name
         self.config: Dict[str, Any] = config
@@ -21,6 +59,8 @@ class MCPServer:
         self.session: ClientSession | None = None
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self.exit_stack: AsyncExitStack = AsyncExitStack()
+        # (fetch time, tools) from the last list_tools() call
+        self._tools_cache: Optional[Tuple[float, List[Any]]] = None
 
     async def initialize(self) -> None:
         """Initialize the server connection."""
@@ -35,7 +75,7 @@ class MCPServer:
         server_params = StdioServerParameters(
             command=command,
             args=self.config["args"],
-            env={**os.environ, **self.config["env"]}
+            env=_get_base_env() | self.config["env"]
             if self.config.get("env")
             else None,
         )
@@ -57,6 +97,9 @@ class MCPServer:
     async def list_tools(self):
         """List available tools from the server.
 
+        The list is cached for `TOOLS_CACHE_TTL` seconds; tools only change
+        when the server restarts.
+
         Returns:
             A list of available tools.
 
@@ -66,6 +109,11 @@ class MCPServer:
         if not self.session:
             raise RuntimeError(f"Server {self.name} not initialized")
 
+        if self._tools_cache is not None:
+            fetched_at, tools = self._tools_cache
+            if time.monotonic() - fetched_at < TOOLS_CACHE_TTL:
+                return list(tools)
+
         tools_response = await self.session.list_tools()
         tools = []
 
@@ -77,7 +125,8 @@ class MCPServer:
                     for tool in item[1]
                 )
 
-        return tools
+        self._tools_cache = (time.monotonic(), tools)
+        return list(tools)
 
     async def execute_tool(
         self,
@@ -85,14 +134,20 @@ class MCPServer:
         arguments: Dict[str, Any],
         retries: int = 2,
         delay: float = 1.0,
+        timeout: Optional[float] = None,
     ) -> Any:
         """Execute a tool with retry mechanism.
 
+        Only transient errors (connection, timeout, OS errors, a dropped
+        stdio stream) are retried, with exponential backoff and jitter. A
+        dropped stream is reconnected before the retry.
+
         Args:
             tool_name: Name of the tool to execute.
             arguments: Tool arguments.
             retries: Number of retry attempts.
-            delay: Delay between retries in seconds.
+            delay: Base delay between retries in seconds, doubled per attempt.
+            timeout: Optional per-attempt timeout in seconds.
 
         Returns:
             Tool execution result.
@@ -108,7 +163,9 @@ class MCPServer:
         while attempt < retries:
             try:
                 logging.info(f"Executing {tool_name}...")
-                result = await self.session.call_tool(tool_name, arguments)
+                result = await asyncio.wait_for(
+                    self.session.call_tool(tool_name, arguments), timeout
+                )
                 return result
 
             except Exception as e:
@@ -116,9 +173,15 @@ class MCPServer:
                 logging.warning(
                     f"Error executing tool: {e}. Attempt {attempt} of {retries}."
                 )
+                if not isinstance(e, _RETRIABLE):
+                    raise
                 if attempt < retries:
-                    logging.info(f"Retrying in {delay} seconds...")
-                    await asyncio.sleep(delay)
+                    sleep_for = delay * (2 ** (attempt - 1)) * (0.5 + random.random())
+                    logging.info(f"Retrying in {sleep_for:.1f} seconds...")
+                    await asyncio.sleep(sleep_for)
+                    if isinstance(e, _STREAM_ERRORS):
+                        await self.cleanup()
+                        await self.initialize()
                 else:
                     logging.error("Max retries reached. Failing.")
                     raise
@@ -129,6 +192,7 @@ class MCPServer:
             try:
                 await self.exit_stack.aclose()
                 self.session = None
+                self._tools_cache = None
                 self.stdio_context = None
             except Exception as e:
                 logging.error(f"Error during cleanup of server {self.name}: {e}")
@@ -137,15 +201,21 @@ class MCPServer:
 class StreamlitMCPServer(MCPServer):
     """Adapted MCP Server class for Streamlit with async bridge."""
 
+    __slots__ = ("_initialized", "async_bridge")
+
     def __init__(self, name: str, config: Dict[str, Any], async_bridge):
         super().__init__(name, config)
         self.async_bridge = async_bridge
         self._initialized = False
 
-    def initialize_sync(self):
-        """Initialize the server connection synchronously using async bridge."""
+    async def initialize_async(self) -> bool:
+        """Initialize the server connection on the bridge loop.
+
+        Returns:
+            True if the server initialized, False otherwise.
+        """
         try:
-            self.async_bridge.run_async(self.initialize())
+            await self.initialize()
             self._initialized = True
             return True
         except Exception as e:
@@ -158,7 +228,9 @@ class StreamlitMCPServer(MCPServer):
 
     def execute_tool_sync(self, tool_name: str, arguments: Dict[str, Any]):
         """Execute tool synchronously using async bridge."""
-        return self.async_bridge.run_async(self.execute_tool(tool_name, arguments))
+        return self.async_bridge.run_async(
+            self.execute_tool(tool_name, arguments), timeout=TOOL_EXECUTION_TIMEOUT
+        )
 
     def cleanup_sync(self):
         """Clean up synchronously using async bridge."""
@@ -1,11 +1,13 @@
 """MCP Server registry for managing multiple servers."""
 
+import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Tuple, cast
 
-from .connection import MCPServer, StreamlitMCPServer
 from mcp_client.config.manager import ConfigurationManager
 
+from .connection import TOOL_EXECUTION_TIMEOUT, MCPServer, StreamlitMCPServer
+
 
 class MCPServerRegistry:
     """Registry for managing multiple MCP servers."""
@@ -14,6 +16,10 @@ class MCPServerRegistry:
         self.config_manager = config_manager
         self.servers: Dict[str, MCPServer] = {}
         self.status: Dict[str, bool] = {}
+        # Tool name -> owning server, built lazily from list_tools()
+        self.tool_index: Dict[str, MCPServer] = {}
+        self._tools: List[Any] = []  # Flat tool list matching tool_index
+        self._tool_index_lock = asyncio.Lock()
 
     async def initialize_servers(self, config_path: str = "config/servers.json") -> Dict[str, bool]:
         """Initialize all servers from configuration.
@@ -26,36 +32,53 @@ class MCPServerRegistry:
         """
         try:
             server_config = self.config_manager.load_servers_config(config_path)
-            servers_data = server_config.get("mcpServers", {})
+            # Shallow copy: the loaded config is cached and shared
+            servers_data = dict(server_config.get("mcpServers", {}))
 
             # Inject Google Maps API key if available
             self._inject_google_maps_key(servers_data)
 
-            for server_name, server_info in servers_data.items():
-                try:
-                    server = MCPServer(server_name, server_info)
-                    await server.initialize()
-                    self.servers[server_name] = server
+            # Start every server at once; startup is dominated by process spawn
+            # and handshake, so total time is the slowest server, not the sum
+            results = await asyncio.gather(
+                *(self._init_one(server_name, server_info) for server_name, server_info in servers_data.items()),
+                return_exceptions=True,
+            )
+
+            for server_name, result in zip(servers_data, results):
+                if isinstance(result, BaseException):
+                    logging.error(f"Failed to initialize server {server_name}: {result}")
+                    self.status[server_name] = False
+                else:
+                    self.servers[server_name] = result
                     self.status[server_name] = True
                     logging.info(f"Successfully initialized server: {server_name}")
-                except Exception as e:
-                    logging.error(f"Failed to initialize server {server_name}: {e}")
-                    self.status[server_name] = False
 
+            await self._refresh_tool_index()
             return self.status
 
         except Exception as e:
             logging.error(f"Error loading server configuration: {e}")
             return {}
 
+    @staticmethod
+    async def _init_one(server_name: str, server_info: Dict[str, Any]) -> MCPServer:
+        """Create and initialize a single server."""
+        server = MCPServer(server_name, server_info)
+        await server.initialize()
+        return server
+
     def _inject_google_maps_key(self, servers_data: Dict[str, Any]) -> None:
         """Inject Google Maps API key if available and server is configured."""
         google_maps_key = self.config_manager.google_maps_api_key
         
         if google_maps_key and "google-maps" in servers_data:
-            if "env" not in servers_data["google-maps"]:
-                servers_data["google-maps"]["env"] = {}
-            servers_data["google-maps"]["env"]["GOOGLE_MAPS_API_KEY"] = google_maps_key
+            # Replace the entry rather than mutating the cached config
+            server_info = servers_data["google-maps"]
+            servers_data["google-maps"] = {
+                **server_info,
+                "env": {**server_info.get("env", {}), "GOOGLE_MAPS_API_KEY": google_maps_key},
+            }
             logging.info("Google Maps API key injected into server configuration.")
         elif "google-maps" in servers_data and not google_maps_key:
             logging.warning("GOOGLE_MAPS_API_KEY not found in environment, google-maps server might not work.")
@@ -63,19 +86,18 @@ class MCPServerRegistry:
     async def get_all_tools(self) -> List[Any]:
         """Get all tools from all initialized servers.
 
+        Served from the tool index when it has been built; otherwise all
+        servers are queried concurrently to build it.
+
         Returns:
             List of all available tools across servers.
         """
-        all_tools = []
-        for server_name, server in self.servers.items():
-            if self.status.get(server_name, False):
-                try:
-                    tools = await server.list_tools()
-                    all_tools.extend(tools)
-                except Exception as e:
-                    logging.error(f"Error getting tools from {server_name}: {e}")
+        if not self.tool_index:
+            async with self._tool_index_lock:
+                if not self.tool_index:
+                    await self._refresh_tool_index()
 
-        return all_tools
+        return list(self._tools)
 
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Execute a tool by finding the appropriate server.
@@ -90,17 +112,45 @@ class MCPServerRegistry:
         Raises:
             ValueError: If tool is not found in any server.
         """
-        for server_name, server in self.servers.items():
-            if self.status.get(server_name, False):
-                try:
-                    tools = await server.list_tools()
-                    tool_names = [tool.name for tool in tools]
-                    if tool_name in tool_names:
-                        return await server.execute_tool(tool_name, arguments)
-                except Exception as e:
-                    logging.error(f"Error checking tools in {server_name}: {e}")
-
-        raise ValueError(f"Tool '{tool_name}' not found in any server")
+        server = self.tool_index.get(tool_name)
+        if server is None:
+            # Unknown name: the index may be stale, rebuild it once
+            async with self._tool_index_lock:
+                server = self.tool_index.get(tool_name)
+                if server is None:
+                    await self._refresh_tool_index()
+                    server = self.tool_index.get(tool_name)
+
+        if server is None:
+            raise ValueError(f"Tool '{tool_name}' not found in any server")
+
+        return await server.execute_tool(tool_name, arguments)
+
+    async def _refresh_tool_index(self) -> None:
+        """Rebuild the tool name -> server index from all initialized servers."""
+        active_servers = [
+            (server_name, server)
+            for server_name, server in self.servers.items()
+            if self.status.get(server_name, False)
+        ]
+        results = await asyncio.gather(
+            *(server.list_tools() for _, server in active_servers),
+            return_exceptions=True,
+        )
+
+        tool_index: Dict[str, MCPServer] = {}
+        all_tools: List[Any] = []
+        for (server_name, server), tools in zip(active_servers, results):
+            if isinstance(tools, BaseException):
+                logging.error(f"Error getting tools from {server_name}: {tools}")
+                continue
+            all_tools.extend(tools)
+            for tool in tools:
+                # First server wins when several expose the same name
+                tool_index.setdefault(tool.name, server)
+
+        self.tool_index = tool_index
+        self._tools = all_tools
 
     async def cleanup_all(self) -> None:
         """Clean up all server connections."""
@@ -113,6 +163,8 @@ class MCPServerRegistry:
 
         self.servers.clear()
         self.status.clear()
+        self.tool_index = {}
+        self._tools = []
 
 
 class StreamlitMCPServerRegistry(MCPServerRegistry):
@@ -123,39 +175,32 @@ class StreamlitMCPServerRegistry(MCPServerRegistry):
         self.async_bridge = async_bridge
         self.servers: Dict[str, StreamlitMCPServer] = {}
 
-    def initialize_servers_sync(self, config_path: str = "config/servers.json") -> Dict[str, bool]:
-        """Initialize servers synchronously using async bridge."""
-        try:
-            server_config = self.config_manager.load_servers_config(config_path)
-            servers_data = server_config.get("mcpServers", {})
-
-            # Inject Google Maps API key if available
-            self._inject_google_maps_key(servers_data)
-
-            for server_name, server_info in servers_data.items():
-                try:
-                    server = StreamlitMCPServer(server_name, server_info, self.async_bridge)
-                    success = server.initialize_sync()
-                    if success:
-                        self.servers[server_name] = server
-                        self.status[server_name] = True
-                        logging.info(f"Successfully initialized server: {server_name}")
-                    else:
-                        self.status[server_name] = False
-                except Exception as e:
-                    logging.error(f"Failed to initialize server {server_name}: {e}")
-                    self.status[server_name] = False
-
-            return self.status
-
-        except Exception as e:
-            logging.error(f"Error loading server configuration: {e}")
-            return {}
-
     def get_all_tools_sync(self) -> List[Any]:
         """Get all tools synchronously using async bridge."""
         return self.async_bridge.run_async(self.get_all_tools())
 
     def execute_tool_sync(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Execute tool synchronously using async bridge."""
-        return self.async_bridge.run_async(self.execute_tool(tool_name, arguments)) 
\ No newline at end of file
+        return self.async_bridge.run_async(
+            self.execute_tool(tool_name, arguments), timeout=TOOL_EXECUTION_TIMEOUT
+        )
+
+    def execute_tools_sync(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Execute several tools concurrently using async bridge.
+
+        Args:
+            calls: (tool_name, arguments) pairs to execute.
+
+        Returns:
+            Results in call order; a call that failed yields its exception.
+        """
+        async def _execute_all() -> List[Any]:
+            return await asyncio.gather(
+                *(self.execute_tool(tool_name, arguments) for tool_name, arguments in calls),
+                return_exceptions=True,
+            )
+
+        return cast(
+            List[Any],
+            self.async_bridge.run_async(_execute_all(), timeout=TOOL_EXECUTION_TIMEOUT),
+        ) 
\ No newline at end of file
@@ -1,10 +1,16 @@
 """MCP Tool schemas and definitions."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class MCPTool:
-    """Represents an MCP tool with its properties and formatting."""
+    """Represents an MCP tool with its properties and formatting.
+
+    Tools are treated as immutable once built, so the LLM-facing text and the
+    Anthropic schema are computed on first use and reused afterwards.
+    """
+
+    __slots__ = ("_fmt", "_schema", "description", "input_schema", "name")
 
     def __init__(
         self, name: str, description: str, input_schema: Dict[str, Any]
@@ -12,6 +18,8 @@ class MCPTool:
         self.name: str = name
         self.description: str = description
         self.input_schema: Dict[str, Any] = input_schema
+        self._fmt: Optional[str] = None
+        self._schema: Optional[Dict[str, Any]] = None
 
     def __str__(self) -> str:
         return f"Tool: {self.name}\nDescription: {self.description}"
@@ -22,11 +30,28 @@ class MCPTool:
         Returns:
             A formatted string describing the tool.
         """
-        return (
-            f"**{self.name}**\n"
-            f"Description: {self.description}\n"
-            f"Input Schema: {self.input_schema}\n"
-        )
+        if self._fmt is None:
+            self._fmt = (
+                f"**{self.name}**\n"
+                f"Description: {self.description}\n"
+                f"Input Schema: {self.input_schema}\n"
+            )
+        return self._fmt
+
+    @property
+    def anthropic_schema(self) -> Dict[str, Any]:
+        """Tool schema in Anthropic format, built once per tool.
+
+        Returns:
+            Dictionary with tool schema for Anthropic API.
+        """
+        if self._schema is None:
+            self._schema = {
+                "name": self.name,
+                "description": self.description,
+                "input_schema": self.input_schema,
+            }
+        return self._schema
 
     def get_anthropic_schema(self) -> Dict[str, Any]:
         """Get tool schema in Anthropic format.
@@ -34,8 +59,4 @@ class MCPTool:
         Returns:
             Dictionary with tool schema for Anthropic API.
         """
-        return {
-            "name": self.name,
-            "description": self.description,
-            "input_schema": self.input_schema,
-        } 
\ No newline at end of file
+        return self.anthropic_schema
@@ -1,6 +1,9 @@
-from fastmcp import FastMCP
-from enum import Enum
 from collections import Counter
+from enum import Enum
+from itertools import accumulate, chain, pairwise
+from operator import itemgetter
+
+from fastmcp import FastMCP
 
 # Create a FastMCP server instance
 mcp = FastMCP(
@@ -8,8 +11,8 @@ mcp = FastMCP(
     instructions="A simple server to manage user purchases."
 )
 
-# Sample data for users and their purchases
-users_purchases = [
+# Sample data for users and their purchases (a tuple, so the index below can't go stale)
+users_purchases = (
     {
         "user_id": 1,
         "username": "alice",
@@ -55,7 +58,26 @@ users_purchases = [
             {"item": "desk lamp", "amount": 30},
         ],
     },
-]
+)
+
+# Every record must carry a purchase history; the code below subscripts it directly
+_missing = [user["username"] for user in users_purchases if "purchases" not in user]
+if _missing:
+    raise ValueError(f"Users without a purchases list: {', '.join(_missing)}")
+
+# Freeze each purchase history too; the aggregates below are computed once
+# and must not drift from the data
+_USERS = tuple({**user, "purchases": tuple(user["purchases"])} for user in users_purchases)
+
+# Purchases keyed by username, built once for O(1) lookups
+_purchases_by_username = {user["username"]: user["purchases"] for user in _USERS}
+
+# Column view of the purchases for aggregation: parallel item/amount tuples,
+# with user i's purchases at [_USER_OFFSETS[i], _USER_OFFSETS[i + 1])
+_histories = tuple(user["purchases"] for user in _USERS)
+_ITEMS = tuple(map(itemgetter("item"), chain.from_iterable(_histories)))
+_AMOUNTS = tuple(map(itemgetter("amount"), chain.from_iterable(_histories)))
+_USER_OFFSETS = tuple(accumulate(map(len, _histories), initial=0))
 
 class PurchaseQuery(str, Enum):
     """Enum for available purchase queries."""
@@ -73,17 +95,84 @@ def get_all_user_purchases() -> list:
     Each user object contains their ID, username, and a list of purchases.
     Each purchase has an item name and the amount.
     """
-    return users_purchases
+    return list(_USERS)
 
 @mcp.tool
 def get_purchases_for_user(username: str) -> list:
     """
     Retrieves the purchase history for a specific user.
     """
-    for user in users_purchases:
-        if user["username"] == username:
-            return user.get("purchases", [])
-    return []
+    # Copy so callers can't modify the indexed list
+    return list(_purchases_by_username.get(username, ()))
+
+def _aggregate() -> tuple:
+    """Compute item counts and totals from the purchase columns.
+
+    Returns:
+        A tuple of (item counts, total amount, number of purchases).
+    """
+    # One Counter serves both item queries and the purchase count
+    item_counts = Counter(_ITEMS)
+    return item_counts, sum(_AMOUNTS), item_counts.total()
+
+_item_counts, _total_amount, _purchase_count = _aggregate()
+
+def _q_most_purchased_item() -> dict:
+    if not _purchase_count:
+        return {"result": "No purchases found."}
+    most_common = _item_counts.most_common(1)[0]
+    return {"most_purchased_item": most_common[0], "count": most_common[1]}
+
+def _q_average_ticket() -> dict:
+    if not _purchase_count:
+        return {"average_ticket": 0}
+    return {"average_ticket": _total_amount / _purchase_count}
+
+def _q_total_revenue() -> dict:
+    return {"total_revenue": _total_amount}
+
+def _q_item_purchase_counts() -> dict:
+    if not _purchase_count:
+        return {"result": "No purchases found."}
+    return {"item_purchase_counts": dict(_item_counts)}
+
+def _q_user_with_most_purchases() -> dict:
+    if not _USERS:
+        return {"result": "No users found."}
+    # Purchase counts fall out of the offsets, no per-user len() calls
+    counts_per_user = [end - start for start, end in pairwise(_USER_OFFSETS)]
+    top_index = max(range(len(counts_per_user)), key=counts_per_user.__getitem__)
+    return {
+        "username": _USERS[top_index]["username"],
+        "purchase_count": counts_per_user[top_index],
+    }
+
+def _q_user_with_highest_spending() -> dict:
+    if not _USERS:
+        return {"result": "No users found."}
+
+    # Per-user totals as differences of the running amount total at each
+    # user's offsets, with no per-user slicing
+    running_total = tuple(accumulate(_AMOUNTS, initial=0))
+    user_totals = [running_total[offset] for offset in _USER_OFFSETS]
+    spending_per_user = [end - start for start, end in pairwise(user_totals)]
+    top_index = max(range(len(spending_per_user)), key=spending_per_user.__getitem__)
+    return {
+        "username": _USERS[top_index]["username"],
+        "total_spending": spending_per_user[top_index],
+    }
+
+_DISPATCH = {
+    PurchaseQuery.MOST_PURCHASED_ITEM: _q_most_purchased_item,
+    PurchaseQuery.AVERAGE_TICKET: _q_average_ticket,
+    PurchaseQuery.TOTAL_REVENUE: _q_total_revenue,
+    PurchaseQuery.USER_WITH_MOST_PURCHASES: _q_user_with_most_purchases,
+    PurchaseQuery.USER_WITH_HIGHEST_SPENDING: _q_user_with_highest_spending,
+    PurchaseQuery.ITEM_PURCHASE_COUNTS: _q_item_purchase_counts,
+}
+
+# The sample data is static, so every query result is computed once at import
+_PRECOMPUTED = {query: handler() for query, handler in _DISPATCH.items()}
 
 @mcp.tool
 def query_purchases(query: PurchaseQuery) -> dict:
@@ -96,59 +185,12 @@ def query_purchases(query: PurchaseQuery) -> dict:
     Returns:
         A dictionary containing the result of the query.
     """
-    all_purchases = [purchase for user in users_purchases for purchase in user["purchases"]]
-
-    if query == PurchaseQuery.MOST_PURCHASED_ITEM:
-        if not all_purchases:
-            return {"result": "No purchases found."}
-        item_counts = Counter(p['item'] for p in all_purchases)
-        most_common = item_counts.most_common(1)[0]
-        return {"most_purchased_item": most_common[0], "count": most_common[1]}
-
-    elif query == PurchaseQuery.AVERAGE_TICKET:
-        if not all_purchases:
-            return {"average_ticket": 0}
-        total_amount = sum(p['amount'] for p in all_purchases)
-        return {"average_ticket": total_amount / len(all_purchases)}
-
-    elif query == PurchaseQuery.TOTAL_REVENUE:
-        total_revenue = sum(p['amount'] for p in all_purchases)
-        return {"total_revenue": total_revenue}
-
-    elif query == PurchaseQuery.ITEM_PURCHASE_COUNTS:
-        if not all_purchases:
-            return {"result": "No purchases found."}
-        item_counts = Counter(p['item'] for p in all_purchases)
-        return {"item_purchase_counts": dict(item_counts)}
-
-    elif query == PurchaseQuery.USER_WITH_MOST_PURCHASES:
-        if not users_purchases:
-            return {"result": "No users found."}
-        user_with_most = max(users_purchases, key=lambda u: len(u.get('purchases', [])), default=None)
-        if user_with_most:
-            return {
-                "username": user_with_most['username'],
-                "purchase_count": len(user_with_most.get('purchases', []))
-            }
-        return {}
-
-    elif query == PurchaseQuery.USER_WITH_HIGHEST_SPENDING:
-        if not users_purchases:
-            return {"result": "No users found."}
-            
-        spending_per_user = [
-            (
-                user['username'],
-                sum(p['amount'] for p in user.get('purchases', []))
-            )
-            for user in users_purchases
-        ]
-        if not spending_per_user:
-            return {}
-        top_spender = max(spending_per_user, key=lambda x: x[1])
-        return {"username": top_spender[0], "total_spending": top_spender[1]}
-
-    return {"error": "Invalid query"}
+    result = _PRECOMPUTED.get(query)
+    if result is None:
+        return {"error": "Invalid query"}
+    # Copy so callers can't modify the cached result; results nest at most
+    # one dict deep, so this is cheaper than a deepcopy
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
 
 
 # To run the server, you would typically have this block:
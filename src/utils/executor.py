@@ -0,0 +1,19 @@
+"""Thread pool sizing for sync work offloaded from MCP event loops."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def create_executor() -> ThreadPoolExecutor:
+    """Create a thread pool sized for concurrent tool-call fan-out.
+
+    Each event loop owns its executor: `loop.close()` shuts down the loop's
+    default executor, so one pool can't be shared between loops.
+
+    Returns:
+        A new ThreadPoolExecutor.
+    """
+    return ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 4) * 4),
+        thread_name_prefix="mcp-",
+    )
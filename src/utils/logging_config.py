@@ -1,16 +1,19 @@
 """Centralized logging configuration for MCP client."""
 
 import logging
+import os
 import sys
 from typing import Optional
 
-from rich.logging import RichHandler
+# Record attributes that need the caller's frame looked up
+_CALLER_FIELDS = ("%(pathname)", "%(filename)", "%(module)", "%(lineno)", "%(funcName)")
 
 
 def setup_logging(
     level: int = logging.INFO,
     format_string: Optional[str] = None,
-    include_timestamp: bool = True
+    include_timestamp: bool = True,
+    fast: Optional[bool] = None
 ) -> None:
     """Set up logging configuration for the MCP client.
 
@@ -18,24 +21,48 @@ def setup_logging(
         level: Logging level (default: INFO).
         format_string: Custom format string for log messages.
         include_timestamp: Whether to include timestamp in log format.
+        fast: Use a plain stream handler instead of Rich. Defaults to
+            True when the MCP_LOG_FAST environment variable is "1".
     """
-    # Use RichHandler for pretty, colorful logging
-    rich_handler = RichHandler(
-        rich_tracebacks=True,
-        show_time=include_timestamp,
-        show_path=False,
-        log_time_format="[%X]",
-    )
+    if fast is None:
+        fast = os.getenv("MCP_LOG_FAST") == "1"
+
+    if fast:
+        # Plain formatting, and skip the thread/process lookups done for
+        # every record
+        handler = logging.StreamHandler(sys.stderr)
+        if format_string is None:
+            format_string = "%(levelname)s %(name)s %(message)s"
+            if include_timestamp:
+                format_string = "%(asctime)s " + format_string
+        logging.logThreads = False
+        logging.logProcesses = False
+    else:
+        # Imported here so the fast path and modules that only need
+        # get_logger() don't load Rich
+        from rich.logging import RichHandler
 
-    if format_string is None:
-        format_string = "%(message)s"
+        # Use RichHandler for pretty, colorful logging
+        handler = RichHandler(
+            rich_tracebacks=True,
+            show_time=include_timestamp,
+            show_path=False,
+            log_time_format="[%X]",
+        )
+        if format_string is None:
+            format_string = "%(message)s"
 
     logging.basicConfig(
         level=level,
         format=format_string,
-        handlers=[rich_handler]
+        handlers=[handler]
     )
 
+    # Rich runs with show_path=False, so unless the format asks for it the
+    # caller lookup (a stack walk per record) is wasted work
+    if not any(field in format_string for field in _CALLER_FIELDS):
+        logging._srcfile = None
+
     # Set specific loggers to avoid noise
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("anthropic").setLevel(logging.WARNING)
@@ -0,0 +1,19 @@
+"""Tracing setup for MCP client."""
+
+_laminar_initialized = False
+
+
+def init_laminar() -> None:
+    """Initialize Laminar tracing once per process.
+
+    Safe to call repeatedly (e.g. on every Streamlit rerun); only the first
+    call initializes the SDK.
+    """
+    global _laminar_initialized
+    if _laminar_initialized:
+        return
+
+    from lmnr import Laminar
+
+    Laminar.initialize()
+    _laminar_initialized = True
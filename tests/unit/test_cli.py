@@ -0,0 +1,104 @@
+"""Unit tests for the CLI application."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from interfaces.cli.app import CLIApp
+
+
+class TestHandleTokenLimitError(unittest.IsolatedAsyncioTestCase):
+    """Test cases for CLIApp._handle_token_limit_error."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = CLIApp()
+        self.app.chat_session = MagicMock()
+        self.app.chat_session.summarize_conversation = AsyncMock(return_value="Summary")
+        self.app.chat_session.store_in_memory = AsyncMock()
+
+    async def test_cut_never_orphans_tool_result(self):
+        """Test that a tool round crossing the cut is dropped with its result."""
+        messages = [{"role": "user", "content": "Find my purchases"}]
+        for i in range(2):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}",
+                            "name": "search",
+                            "input": {},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}",
+                            "content": "laptop",
+                        }
+                    ],
+                }
+            )
+        messages.append(
+            {"role": "assistant", "content": [{"type": "text", "text": "A laptop."}]}
+        )
+        messages.append({"role": "user", "content": "Thanks"})
+        messages.append(
+            {"role": "assistant", "content": [{"type": "text", "text": "Welcome!"}]}
+        )
+
+        await self.app._handle_token_limit_error(messages)
+
+        # The last 5 messages start at call_1's result, so the cut moves to "Thanks"
+        self.assertEqual(messages[0], {"role": "user", "content": "Thanks"})
+        self.assertEqual(len(messages), 2)
+        self.app.chat_session.reset_api_messages.assert_called_once_with(messages)
+
+    async def test_cut_keeps_question_of_long_tool_turn(self):
+        """Test that a window made only of tool rounds keeps the question they answer."""
+        messages = [{"role": "user", "content": "Plan my trip"}]
+        for i in range(3):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}",
+                            "name": "directions",
+                            "input": {},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}",
+                            "content": "left",
+                        }
+                    ],
+                }
+            )
+        original = list(messages)
+
+        await self.app._handle_token_limit_error(messages)
+
+        self.assertEqual(messages, original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,12 @@
 
 import json
 import os
+import sys
 import tempfile
 import unittest
-from unittest.mock import patch
-
-import sys
 from pathlib import Path
+from unittest.mock import MagicMock, mock_open, patch
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 from mcp_client.config.manager import ConfigurationManager
@@ -47,7 +47,6 @@ class TestConfigurationManager(unittest.TestCase):
 
     def test_load_servers_config(self):
         """Test loading servers configuration from JSON file."""
-        # Create a temporary config file
         test_config = {
             "mcpServers": {
                 "test_server": {
@@ -56,14 +55,32 @@ class TestConfigurationManager(unittest.TestCase):
                 }
             }
         }
-        
+        data = json.dumps(test_config)
+
+        # Served from memory; the mtime/size check only needs a stat result.
+        # The cache is patched so the fake entry doesn't outlive the test.
+        with patch("mcp_client.config.manager.os.stat", return_value=MagicMock(st_mtime_ns=1, st_size=len(data))), \
+                patch("builtins.open", mock_open(read_data=data)), \
+                patch.dict("mcp_client.config.manager._SERVERS_CONFIG_CACHE"):
+            loaded_config = ConfigurationManager.load_servers_config("in_memory_servers.json")
+
+        self.assertEqual(loaded_config, test_config)
+
+    def test_load_servers_config_reloads_when_file_changes(self):
+        """Test cached config is re-read after the file is modified."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
+            json.dump({"mcpServers": {}}, f)
             temp_file = f.name
-        
+
         try:
-            loaded_config = ConfigurationManager.load_servers_config(temp_file)
-            self.assertEqual(loaded_config, test_config)
+            first = ConfigurationManager.load_servers_config(temp_file)
+            self.assertIs(ConfigurationManager.load_servers_config(temp_file), first)
+
+            updated_config = {"mcpServers": {"new_server": {"command": "cmd", "args": []}}}
+            with open(temp_file, "w") as f:
+                json.dump(updated_config, f)
+
+            self.assertEqual(ConfigurationManager.load_servers_config(temp_file), updated_config)
         finally:
             os.unlink(temp_file)
 
@@ -0,0 +1,392 @@
+"""Unit tests for conversation management."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from mcp.types import ImageContent, TextContent
+
+from mcp_client.llm.conversation import (
+    MAX_TOOL_RESULT_CHARS,
+    TRUNCATED_RESULT_CHARS,
+    ChatSession,
+    tool_result_text,
+    truncate_result_text,
+)
+
+
+class TestPruneMessages(unittest.TestCase):
+    """Test cases for ChatSession.prune_messages_with_summary."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.session = ChatSession(server_registry=None, llm_client=None)
+        self.session.max_messages_to_keep = 3
+        self.session.max_tokens_to_keep = None
+        self.messages = []
+        for message in [
+            {"role": "user", "content": "Find my purchases"},
+            {
+                "role": "assistant",
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": "call_1",
+                        "name": "get_purchases_for_user",
+                        "input": {"username": "alice"},
+                    }
+                ],
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": "call_1",
+                        "content": "laptop",
+                    }
+                ],
+            },
+            {
+                "role": "assistant",
+                "content": [{"type": "text", "text": "You bought a laptop."}],
+            },
+            {"role": "user", "content": "Thanks"},
+        ]:
+            self.session.append_message(self.messages, message)
+
+    def test_prune_keeps_tool_pair_together(self):
+        """Test that the cut never separates a tool_result from its tool_use."""
+        pruned = self.session.prune_messages_with_summary(self.messages)
+
+        self.assertEqual(len(pruned), 4)
+        self.assertEqual(pruned[0]["content"][0]["type"], "tool_use")
+        self.assertEqual(pruned[1]["content"][0]["type"], "tool_result")
+
+    def test_prune_prepends_summary_to_plain_user_message(self):
+        """Test that the summary is added to a leading plain user message."""
+        self.session.max_messages_to_keep = 1
+
+        pruned = self.session.prune_messages_with_summary(
+            self.messages, "Alice asked about purchases"
+        )
+
+        self.assertEqual(len(pruned), 1)
+        self.assertIn("Alice asked about purchases", pruned[0]["content"])
+        self.assertTrue(pruned[0]["content"].endswith("Thanks"))
+
+    def test_prune_without_cached_kinds(self):
+        """Test pruning a history that wasn't built through append_message."""
+        session = ChatSession(server_registry=None, llm_client=None)
+        session.max_messages_to_keep = 3
+        session.max_tokens_to_keep = None
+
+        pruned = session.prune_messages_with_summary(list(self.messages))
+
+        self.assertEqual(pruned[0]["content"][0]["type"], "tool_use")
+
+    @patch("mcp_client.llm.conversation.estimate_content_tokens", return_value=100)
+    def test_prune_by_token_budget(self, _):
+        """Test that the newest messages fitting the token budget are kept."""
+        self.session.max_tokens_to_keep = 350
+
+        pruned = self.session.prune_messages_with_summary(self.messages)
+
+        # Three messages fit, the tool_use before them is kept with its result
+        self.assertEqual(len(pruned), 4)
+        self.assertEqual(pruned[0]["content"][0]["type"], "tool_use")
+
+        self.session.max_tokens_to_keep = 1000
+        self.assertIs(
+            self.session.prune_messages_with_summary(self.messages), self.messages
+        )
+
+    def test_prune_keeps_current_turn_question(self):
+        """Test that tool rounds over the budget never drop the question they answer."""
+        session = ChatSession(server_registry=None, llm_client=None)
+        messages = [{"role": "user", "content": "Plan my trip"}]
+        for i in range(4):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}",
+                            "name": "directions",
+                            "input": {},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}",
+                            "content": "x" * 10_000,
+                        }
+                    ],
+                }
+            )
+        session.max_tokens_to_keep = 8000
+
+        pruned = session.prune_messages_with_summary(messages)
+
+        self.assertEqual(pruned, messages)
+
+    def test_clean_messages_for_api_reflects_edits(self):
+        """Test that cleaning drops extra fields and sees in-place edits."""
+        messages = [{"role": "user", "content": "Hello", "timestamp": "now"}]
+        self.assertEqual(
+            self.session.clean_messages_for_api(messages),
+            [{"role": "user", "content": "Hello"}],
+        )
+
+        messages[0] = {"role": "user", "content": "Hi"}
+        self.assertEqual(
+            self.session.clean_messages_for_api(messages),
+            [{"role": "user", "content": "Hi"}],
+        )
+
+
+class TestCompressToolResults(unittest.TestCase):
+    """Test cases for ChatSession.compress_tool_results."""
+
+    def test_compress_older_tool_results(self):
+        """Test that only results before the last `keep_last_n` are digested."""
+        session = ChatSession(server_registry=None, llm_client=None)
+        messages = []
+        for i in range(3):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}",
+                            "name": "search",
+                            "input": {},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}",
+                            "content": f"first line\n{i}" + "x" * 500,
+                        }
+                    ],
+                }
+            )
+
+        compressed = session.compress_tool_results(messages, keep_last_n=1)
+
+        self.assertTrue(
+            compressed[1]["content"][0]["content"].startswith(
+                "[search] OK (512 chars) | first line"
+            )
+        )
+        self.assertTrue(
+            compressed[3]["content"][0]["content"].startswith("[search] OK")
+        )
+        self.assertIs(compressed[5], messages[5])
+        self.assertEqual(len(messages[1]["content"][0]["content"]), 512)
+        self.assertIs(
+            session.compress_tool_results(messages, keep_last_n=1)[1], compressed[1]
+        )
+
+    def test_parallel_results_in_a_round_are_kept_together(self):
+        """Test that rounds, not blocks, are counted and the newest is never digested."""
+        session = ChatSession(server_registry=None, llm_client=None)
+        messages = []
+        for i in range(2):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}_{k}",
+                            "name": "search",
+                            "input": {},
+                        }
+                        for k in range(4)
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}_{k}",
+                            "content": f"{i}{k}" + "x" * 500,
+                        }
+                        for k in range(4)
+                    ],
+                }
+            )
+
+        compressed = session.compress_tool_results(messages, keep_last_n=1)
+
+        self.assertTrue(
+            all(
+                block["content"].startswith("[search] OK")
+                for block in compressed[1]["content"]
+            )
+        )
+        self.assertIs(compressed[3], messages[3])
+        self.assertIs(
+            session.compress_tool_results(messages, keep_last_n=0)[3], messages[3]
+        )
+        self.assertIs(session.compress_tool_results(messages), messages)
+
+    def test_repeated_tool_results_point_to_first(self):
+        """Test that an identical later result is replaced by a pointer back."""
+        session = ChatSession(server_registry=None, llm_client=None)
+        messages = []
+        for i in range(2):
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"call_{i}",
+                            "name": "retrieve",
+                            "input": {"key": "k"},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"call_{i}",
+                            "content": "y" * 500,
+                        }
+                    ],
+                }
+            )
+
+        compressed = session.compress_tool_results(messages)
+
+        self.assertIs(compressed[1], messages[1])
+        self.assertEqual(
+            compressed[3]["content"][0]["content"], "[identical to tool_result call_0]"
+        )
+
+        # A digested copy is never pointed at; the later one is sent in full
+        compressed = session.compress_tool_results(messages, keep_last_n=1)
+
+        self.assertTrue(
+            compressed[1]["content"][0]["content"].startswith("[retrieve] OK")
+        )
+        self.assertIs(compressed[3], messages[3])
+
+
+class TestTruncateResultText(unittest.TestCase):
+    """Test cases for truncate_result_text."""
+
+    def test_short_result_is_joined(self):
+        """Test that results under the cap are joined with spaces."""
+        self.assertEqual(truncate_result_text(["a", "b"]), "a b")
+
+    def test_long_result_stops_at_cap(self):
+        """Test that parts past the cap are never consumed."""
+
+        def parts():
+            yield "x" * MAX_TOOL_RESULT_CHARS
+            yield "y"
+            raise AssertionError("consumed past the cap")
+
+        text = truncate_result_text(parts())
+
+        self.assertTrue(
+            text.startswith("x" * TRUNCATED_RESULT_CHARS + "... [Content truncated")
+        )
+
+
+class TestToolResultText(unittest.TestCase):
+    """Test cases for tool_result_text."""
+
+    def test_content_items_are_joined(self):
+        """Test that MCP content items are converted per type and joined."""
+        result = MagicMock(
+            content=[
+                TextContent(type="text", text="laptop"),
+                ImageContent(type="image", data="aGk=", mimeType="image/png"),
+            ]
+        )
+
+        self.assertEqual(tool_result_text(result), "laptop [Image content returned]")
+
+    def test_plain_result_is_stringified(self):
+        """Test that results without content lists are sent as strings."""
+        self.assertEqual(tool_result_text("Error: boom"), "Error: boom")
+
+
+class TestSummarizeConversation(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ChatSession.summarize_conversation."""
+
+    async def test_summarize_only_new_messages(self):
+        """Test that messages already summarized aren't sent again."""
+        llm_client = MagicMock()
+        llm_client.get_response.return_value.content = [
+            MagicMock(type="text", text="Summary")
+        ]
+        session = ChatSession(server_registry=None, llm_client=llm_client)
+        messages = [{"role": "user", "content": "Hello"}]
+
+        self.assertEqual(await session.summarize_conversation(messages), "Summary")
+        self.assertEqual(await session.summarize_conversation(messages), "Summary")
+        self.assertEqual(llm_client.get_response.call_count, 1)
+
+        messages.append(
+            {"role": "assistant", "content": [{"type": "text", "text": "Hi there"}]}
+        )
+        await session.summarize_conversation(messages)
+
+        prompt = llm_client.get_response.call_args[0][0][0]["content"]
+        self.assertIn("Hi there", prompt)
+        self.assertNotIn("user: Hello", prompt)
+
+
+class TestStoreInMemory(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ChatSession.store_in_memory."""
+
+    async def test_queued_writes_are_coalesced_and_flushed(self):
+        """Test that bursts keep the latest value per key and cleanup flushes them."""
+        registry = MagicMock()
+        registry.execute_tool = AsyncMock()
+        registry.cleanup_all = AsyncMock()
+        session = ChatSession(server_registry=registry, llm_client=None)
+
+        await session.store_in_memory("conversation_summary", "first")
+        await session.store_in_memory("conversation_summary", "second")
+        registry.execute_tool.assert_not_called()
+
+        await session.cleanup_servers()
+
+        registry.execute_tool.assert_awaited_once_with(
+            "store", {"key": "conversation_summary", "value": "second"}
+        )
+        registry.cleanup_all.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
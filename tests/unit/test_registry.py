@@ -0,0 +1,67 @@
+"""Unit tests for the MCP server registry."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from mcp_client.servers.registry import MCPServerRegistry
+from mcp_client.tools.schemas import MCPTool
+
+
+def make_server(*tool_names):
+    """Build a stand-in server exposing the given tools."""
+    server = MagicMock()
+    server.list_tools = AsyncMock(
+        return_value=[MCPTool(name, "", {}) for name in tool_names]
+    )
+    server.execute_tool = AsyncMock(return_value="result")
+    return server
+
+
+class TestToolDispatch(unittest.IsolatedAsyncioTestCase):
+    """Test cases for routing tool calls through the tool index."""
+
+    async def asyncSetUp(self):
+        """Set up test fixtures."""
+        self.registry = MCPServerRegistry(MagicMock())
+        self.maps = make_server("geocode", "directions")
+        self.memory = make_server("store", "retrieve")
+        for name, server in (("maps", self.maps), ("memory", self.memory)):
+            self.registry.servers[name] = server
+            self.registry.status[name] = True
+
+    async def test_execute_tool_routes_to_owner(self):
+        """Test that a call goes to the server exposing the tool."""
+        result = await self.registry.execute_tool("store", {"key": "k"})
+
+        self.assertEqual(result, "result")
+        self.memory.execute_tool.assert_awaited_once_with("store", {"key": "k"})
+        self.maps.execute_tool.assert_not_called()
+
+    async def test_index_is_built_once(self):
+        """Test that later calls don't list tools again."""
+        await self.registry.execute_tool("geocode", {})
+        await self.registry.execute_tool("retrieve", {})
+
+        self.assertEqual(self.maps.list_tools.await_count, 1)
+        self.assertEqual(self.memory.list_tools.await_count, 1)
+
+    async def test_unknown_tool_raises(self):
+        """Test that an unknown tool raises ValueError."""
+        with self.assertRaises(ValueError):
+            await self.registry.execute_tool("missing", {})
+
+    async def test_get_all_tools_skips_failed_servers(self):
+        """Test that a server failing to list tools doesn't hide the others."""
+        self.maps.list_tools.side_effect = RuntimeError("down")
+
+        tools = await self.registry.get_all_tools()
+
+        self.assertEqual([tool.name for tool in tools], ["store", "retrieve"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,9 @@
 """Unit tests for MCP tool schemas."""
 
-import unittest
-
 import sys
+import unittest
 from pathlib import Path
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 from mcp_client.tools.schemas import MCPTool
@@ -12,9 +12,10 @@ from mcp_client.tools.schemas import MCPTool
 class TestMCPTool(unittest.TestCase):
     """Test cases for MCPTool."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.tool = MCPTool(
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared tool; no test modifies it."""
+        cls.tool = MCPTool(
             name="test_tool",
             description="A test tool for unit testing",
             input_schema={
@@ -64,6 +65,17 @@ class TestMCPTool(unittest.TestCase):
         
         self.assertEqual(schema, expected_schema)
 
+    def test_get_anthropic_schema_is_cached(self):
+        """Test schema is built once and reused on later calls."""
+        first = self.tool.get_anthropic_schema()
+        second = self.tool.get_anthropic_schema()
+        self.assertIs(first, second)
+        self.assertIs(self.tool.anthropic_schema, first)
+
+    def test_format_for_llm_is_cached(self):
+        """Test formatted text is built once and reused on later calls."""
+        self.assertIs(self.tool.format_for_llm(), self.tool.format_for_llm())
+
     def test_empty_input_schema(self):
         """Test tool with empty input schema."""
         tool = MCPTool("empty_tool", "Tool with no params", {})